@@ -0,0 +1,364 @@
+import argparse
+import contextlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import soundfile as sf
+
+# Script measured by the benchmark
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main_ver3.3.py")
+
+# Kinds of files in the generated corpus. An "lr_pair" is two mono files
+# named "... L.wav" and "... R.wav".
+FILE_KINDS = ["mono", "stereo", "dualmono", "silent_left", "silent_right", "lr_pair"]
+SUBTYPES = ["PCM_16", "PCM_24", "FLOAT"]
+SAMPLERATE = 48000
+
+# Files of the large project layout used to time the directory scan and
+# the L/R pairing (headers only, so they are kept short)
+LAYOUT_FILE_SECONDS = 0.05
+LAYOUT_FOLDERS = ["01- DRUMS", "02- BASS", "03- GUITARS", "04- KEYS", "05- VOCALS", "06- STRINGS"]
+
+def load_app():
+    """
+    Import the app script as module "aps_main".
+
+    The module is registered in sys.modules so its functions can be pickled
+    for the analysis pool, and the pool forks where the platform allows it:
+    spawned workers could not import a module loaded from a file path.
+    Forking is safe here, as the benchmark runs no Tk thread.
+    """
+    spec = importlib.util.spec_from_file_location("aps_main", APP_SCRIPT)
+    app = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = app
+    spec.loader.exec_module(app)
+    if "fork" in multiprocessing.get_all_start_methods():
+        app.ANALYSIS_START_METHOD = "fork"
+    return app
+
+def expect_outputs(outputs, count, name):
+    """
+    Make sure a benchmarked call produced all its outputs, so a run can
+    never pass while measuring only error handling.
+    """
+    failed = sum(1 for output in outputs if not output)
+    if len(outputs) != count or failed:
+        raise RuntimeError(f"{name}: expected {count} outputs, got {len(outputs)} ({failed} failed)")
+    return outputs
+
+def make_signal(rng, frames):
+    """Deterministic noise with a slow envelope, in [-0.5, 0.5]."""
+    envelope = 0.5 + 0.5 * np.sin(np.linspace(0, 6 * np.pi, frames))
+    return (rng.uniform(-0.5, 0.5, frames) * envelope).astype(np.float32)
+
+def write_kind(folder, name, kind, frames, subtype, rng):
+    """
+    Write one corpus item.
+
+    Returns:
+        list: The files written
+    """
+    left = make_signal(rng, frames)
+    silence = np.zeros(frames, dtype=np.float32)
+    channels = {
+        "mono": left,
+        "stereo": np.column_stack([left, make_signal(rng, frames)]),
+        "dualmono": np.column_stack([left, left]),
+        "silent_left": np.column_stack([silence, left]),
+        "silent_right": np.column_stack([left, silence]),
+    }
+    if kind == "lr_pair":
+        paths = [os.path.join(folder, f"{name} L.wav"), os.path.join(folder, f"{name} R.wav")]
+        sf.write(paths[0], left, SAMPLERATE, subtype=subtype)
+        sf.write(paths[1], make_signal(rng, frames), SAMPLERATE, subtype=subtype)
+        return paths
+    path = os.path.join(folder, f"{name}.wav")
+    sf.write(path, channels[kind], SAMPLERATE, subtype=subtype)
+    return [path]
+
+def generate_corpus(folder, durations, subtypes, files_per_kind, seed=0):
+    """
+    Generate every file kind for every subtype and duration. The same
+    arguments always produce the same files.
+
+    Returns:
+        dict: Number of files and bytes written
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder, exist_ok=True)
+    files = []
+    for subtype in subtypes:
+        for duration in durations:
+            for kind in FILE_KINDS:
+                for index in range(files_per_kind):
+                    name = f"{kind} {subtype} {duration:g}s {index + 1:03d}"
+                    files += write_kind(folder, name, kind, int(duration * SAMPLERATE), subtype, rng)
+    return {"files": len(files), "bytes": sum(os.path.getsize(file) for file in files)}
+
+def generate_layout(folder, file_count, seed=0):
+    """
+    Generate a large project tree: short files spread over category folders,
+    half of them L/R pairs with some near-identical names.
+
+    Returns:
+        dict: Number of files and bytes written
+    """
+    rng = np.random.default_rng(seed)
+    files = []
+    frames = int(LAYOUT_FILE_SECONDS * SAMPLERATE)
+    index = 0
+    while len(files) < file_count:
+        subfolder = os.path.join(folder, LAYOUT_FOLDERS[index % len(LAYOUT_FOLDERS)])
+        os.makedirs(subfolder, exist_ok=True)
+        kind = "lr_pair" if index % 2 == 0 else FILE_KINDS[index % 5]
+        # Near-identical names: every fifth pair reuses the name of a pair in
+        # another folder, which makes an ambiguous L/R group
+        name = f"Track {index - 4 if index % 10 == 4 else index:04d}"
+        files += write_kind(subfolder, name, kind, frames, "PCM_24", rng)
+        index += 1
+    return {"files": len(files), "bytes": sum(os.path.getsize(file) for file in files)}
+
+def wav_files(folder):
+    return sorted(os.path.join(root, file) for root, _, files in os.walk(folder)
+                  for file in files if file.endswith(".wav"))
+
+def measure(function, setup=None, runs=3):
+    """
+    Time function(setup()) and trace its peak Python/numpy memory.
+
+    The setup is not timed. Timing runs are done without tracemalloc (which
+    slows allocation down); one extra run is traced for the peak memory.
+
+    Returns:
+        tuple: (best seconds, peak memory in MB)
+    """
+    timings = []
+    for _ in range(runs):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+
+    argument = setup() if setup else None
+    tracemalloc.start()
+    try:
+        function(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak / 1e6
+
+def worker_peak_rss_mb():
+    """
+    Peak resident memory of the largest finished child process (the analysis
+    pool workers), which tracemalloc in this process cannot see.
+
+    Returns:
+        float: Peak RSS in MB, or None where the platform does not report it
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+def report(seconds, peak_mb, files, megabytes):
+    return {
+        "seconds": round(seconds, 4),
+        "files": files,
+        "megabytes": round(megabytes, 3),
+        "files_per_second": round(files / seconds, 2) if seconds else None,
+        "mb_per_second": round(megabytes / seconds, 2) if seconds else None,
+        "peak_memory_mb": round(peak_mb, 3),
+    }
+
+def run_benchmarks(app, corpus, layout, work_folder, runs, workers):
+    """
+    Run every benchmark.
+
+    Benchmarks that rename or convert files work on a fresh copy of the
+    corpus for each run, and the app's per-run memos are reset so no run
+    profits from an earlier one.
+
+    The analysis benchmarks report the bytes the analysis actually reads
+    (true stereo files are only read up to their first block), so their
+    mb_per_second is real disk throughput rather than corpus size over time.
+    """
+    results = {}
+    corpus_files = wav_files(corpus)
+    stereo_files = [file for file in corpus_files if not os.path.basename(file).startswith(("mono", "lr_pair"))]
+
+    def megabytes(files):
+        return sum(os.path.getsize(file) for file in files) / 1e6
+
+    def fresh_copy():
+        copy = os.path.join(work_folder, "copy")
+        shutil.rmtree(copy, ignore_errors=True)
+        shutil.copytree(corpus, copy, ignore=shutil.ignore_patterns(".*"))
+        app._audio_info_cache.clear()
+        app.get_snapshot(copy, rescan=True)
+        return copy
+
+    def reset_memos():
+        app._audio_info_cache.clear()
+
+    dualmono_corpus_files = [file for file in corpus_files if os.path.basename(file).startswith("dualmono")]
+    analysis_megabytes = sum(app.analyze_audio_file(file)['bytes_read'] for file in corpus_files) / 1e6
+
+    def identify(copy):
+        labeled_files = []
+        dualmono_files = app.identify_audio_type(copy, workers, app.ConsoleProgress(), interactive=False,
+                                                 labeled_files=labeled_files)
+        expect_outputs([labeled_file['audio_type'] for labeled_file in labeled_files], len(corpus_files), "identify_audio_type")
+        expect_outputs(dualmono_files, len(dualmono_corpus_files), "identify_audio_type (dualmono files)")
+        return dualmono_files
+
+    def identified_copy():
+        copy = fresh_copy()
+        dualmono_files = identify(copy)
+        # Drop the mono versions captured while analysing, so the conversion
+        # itself is measured rather than a rename
+        app.discard_prepared_mono_files()
+        return copy, dualmono_files
+
+    # Analysis of one file at a time (no renaming)
+    seconds, peak = measure(lambda _: expect_outputs([app.get_audio_type(file) for file in corpus_files],
+                                                     len(corpus_files), "get_audio_type"), reset_memos, runs)
+    results["get_audio_type"] = report(seconds, peak, len(corpus_files), analysis_megabytes)
+
+    # Classification of decoded stereo data
+    stereo_data = [sf.read(file, dtype=app.get_native_dtype(sf.info(file).subtype)) for file in stereo_files]
+    # The list is bound as a default, as the name is deleted once measured
+    seconds, peak = measure(lambda _, stereo_data=stereo_data: [app.detect_audio_type(data) for data, _ in stereo_data],
+                            runs=runs)
+    results["detect_audio_type"] = report(seconds, peak, len(stereo_data),
+                                          sum(data.nbytes for data, _ in stereo_data) / 1e6)
+    del stereo_data
+
+    # Whole identification stage, analysis pool included. This is the first
+    # benchmark to start the pool, so the children's peak RSS is its own.
+    seconds, peak = measure(lambda copy: (identify(copy), app.discard_prepared_mono_files()), fresh_copy, runs)
+    results["identify_audio_type"] = report(seconds, peak, len(corpus_files), analysis_megabytes)
+    worker_peak = worker_peak_rss_mb()
+    results["identify_audio_type"]["worker_peak_rss_mb"] = round(worker_peak, 3) if worker_peak is not None else None
+
+    # Dualmono conversion of the files labeled by the identification
+    seconds, peak = measure(lambda setup: expect_outputs(
+                                app.convert_dualmono_to_mono(setup[1], True, progress_window=app.ConsoleProgress()),
+                                len(dualmono_corpus_files), "convert_dualmono_to_mono"),
+                            identified_copy, runs)
+    results["convert_dualmono_to_mono"] = report(seconds, peak, len(dualmono_corpus_files), megabytes(dualmono_corpus_files))
+
+    # Stereo merge of every L/R pair, one pair at a time
+    def pairs_copy():
+        copy = fresh_copy()
+        return [(file, file[:-len("L.wav")] + "R.wav") for file in wav_files(copy) if file.endswith(" L.wav")]
+
+    pair_files = [file for file in corpus_files if os.path.basename(file).startswith("lr_pair")]
+    seconds, peak = measure(lambda pairs: expect_outputs([app.convert_to_stereo(left, right) for left, right in pairs],
+                                                         len(pairs), "convert_to_stereo"), pairs_copy, runs)
+    results["convert_to_stereo"] = report(seconds, peak, len(pair_files), megabytes(pair_files))
+
+    # Directory scan and L/R pairing of a large project
+    layout_files = wav_files(layout)
+    seconds, peak = measure(lambda _: app.get_snapshot(layout, rescan=True), runs=runs)
+    results["project_scan"] = report(seconds, peak, len(layout_files), 0)
+    seconds, peak = measure(lambda _: app.pair_LR_files(app.find_matching_files(layout), include_ambiguous=True), runs=runs)
+    results["find_matching_files"] = report(seconds, peak, len(layout_files), 0)
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Compare throughput with a baseline run.
+
+    Returns:
+        list: Descriptions of the benchmarks that got slower than the tolerance
+    """
+    regressions = []
+    for name, result in results.items():
+        old_result = baseline.get("benchmarks", {}).get(name)
+        if not old_result or not old_result.get("files_per_second") or not result["files_per_second"]:
+            continue
+        change = result["files_per_second"] / old_result["files_per_second"] - 1
+        print(f"{name:28} {old_result['files_per_second']:>10.1f} -> {result['files_per_second']:>10.1f} files/s ({change:+.1%})")
+        if change < -tolerance:
+            regressions.append(f"{name} is {-change:.1%} slower")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis and conversion paths of Audio Project Sanitizer.")
+    parser.add_argument("--durations", default="1,10", help="comma-separated file durations in seconds")
+    parser.add_argument("--subtypes", default=",".join(SUBTYPES), help="comma-separated WAV subtypes")
+    parser.add_argument("--files", type=int, default=2, help="files per kind, subtype and duration")
+    parser.add_argument("--layout-files", type=int, default=1000, help="files in the large project layout")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per benchmark (best is reported)")
+    parser.add_argument("--workers", type=int, default=None, help="analysis worker processes (default: one per CPU core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated audio")
+    parser.add_argument("--output", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with results saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="slowdown against the baseline reported as a regression (0.10 = 10%%)")
+    parser.add_argument("--keep", metavar="FOLDER", help="generate the corpus in FOLDER and keep it")
+    args = parser.parse_args()
+
+    durations = [float(duration) for duration in args.durations.split(",")]
+    subtypes = args.subtypes.split(",")
+    work_folder = args.keep or tempfile.mkdtemp(prefix="aps-benchmark-")
+    corpus = os.path.join(work_folder, "corpus")
+    layout = os.path.join(work_folder, "layout")
+    try:
+        shutil.rmtree(corpus, ignore_errors=True)
+        shutil.rmtree(layout, ignore_errors=True)
+        corpus_info = generate_corpus(corpus, durations, subtypes, args.files, args.seed)
+        layout_info = generate_layout(layout, args.layout_files, args.seed)
+
+        app = load_app()
+        # The app's own progress messages go to stderr, the results to stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            benchmarks = run_benchmarks(app, corpus, layout, work_folder, args.runs, args.workers)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_folder, ignore_errors=True)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"durations": durations, "subtypes": subtypes, "files_per_kind": args.files,
+                   "seed": args.seed, **corpus_info},
+        "layout": layout_info,
+        "memory_note": "peak_memory_mb is traced by tracemalloc in the benchmark process only: it misses "
+                       "the analysis pool workers and libsndfile's own buffers. worker_peak_rss_mb is the "
+                       "peak resident memory of the largest pool worker.",
+        "benchmarks": benchmarks,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(benchmarks, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
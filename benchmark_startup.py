@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Script measured by the benchmark
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main_ver3.3.py")
+
+# Modules that must not be imported before the folder picker is shown
+DEFERRED_MODULES = ["numpy", "soundfile", "webbrowser"]
+
+# Code run in a fresh interpreter for every measurement: it imports the
+# application and, if a display is available, creates the Tk root the
+# folder picker is shown on
+MEASURE_CODE = r"""
+import importlib.util, json, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("aps_main", sys.argv[1])
+app = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(app)
+imported = time.perf_counter()
+loaded_early = [name for name in sys.argv[2:] if name in sys.modules]
+
+first_window = None
+try:
+    root = app.tk.Tk()
+    root.withdraw()
+    root.update()
+    first_window = time.perf_counter() - start
+    root.destroy()
+except Exception:
+    pass  # No display: only the import time is measured
+
+print(json.dumps({
+    "import_seconds": imported - start,
+    "first_window_seconds": first_window,
+    "loaded_before_picker": loaded_early,
+}))
+"""
+
+def measure_once():
+    """
+    Measure one cold start in a new interpreter.
+
+    Returns:
+        dict: import_seconds, first_window_seconds (None without a display),
+        interpreter_seconds (total process time) and loaded_before_picker
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", MEASURE_CODE, APP_SCRIPT] + DEFERRED_MODULES,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["interpreter_seconds"] = time.perf_counter() - start
+    return result
+
+def run_benchmark(runs):
+    samples = [measure_once() for _ in range(runs)]
+
+    def median(key):
+        values = sorted(sample[key] for sample in samples if sample[key] is not None)
+        return values[len(values) // 2] if values else None
+
+    return {
+        "runs": runs,
+        "import_seconds": median("import_seconds"),
+        "first_window_seconds": median("first_window_seconds"),
+        "interpreter_seconds": median("interpreter_seconds"),
+        "loaded_before_picker": sorted({name for sample in samples for name in sample["loaded_before_picker"]}),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold-start latency of Audio Project Sanitizer.")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to measure (median is reported)")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="maximum seconds until the folder picker window can appear")
+    parser.add_argument("--output", metavar="FILE", help="also save the results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+    results["budget_seconds"] = args.budget
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    # Fail on regressions: heavy modules imported too early or budget exceeded
+    startup = results["first_window_seconds"] or results["import_seconds"]
+    if results["loaded_before_picker"]:
+        print(f"Regression: imported before the folder picker: {', '.join(results['loaded_before_picker'])}")
+        return 1
+    if startup > args.budget:
+        print(f"Regression: startup took {startup:.3f}s (budget {args.budget:.3f}s)")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
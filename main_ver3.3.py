@@ -1,14 +1,937 @@
 import os
+import sys
 import platform
-import tkinter as tk
-from tkinter import ttk
+import importlib
 import threading
-from tkinter import filedialog, messagebox
-import soundfile as sf
-import numpy as np
+import argparse
+import contextlib
+import csv
+import errno
 import re
-import webbrowser
 import shutil
+import struct
+import json
+import time
+import hashlib
+import multiprocessing
+import queue
+from collections import deque, namedtuple
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first use.
+
+    Heavy modules are loaded this way so the folder picker appears without
+    waiting for them: numpy/soundfile load when analysis begins, webbrowser
+    only for the donation link, and tkinter is never imported by the
+    headless mode or the analysis worker processes. Once loaded, the
+    module's attributes are copied onto the proxy, so later lookups cost
+    the same as on the real module.
+    """
+    def __init__(self, name):
+        self.__module_name = name
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self.__module_name)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+np = LazyModule("numpy")
+sf = LazyModule("soundfile")
+webbrowser = LazyModule("webbrowser")
+tk = LazyModule("tkinter")
+ttk = LazyModule("tkinter.ttk")
+filedialog = LazyModule("tkinter.filedialog")
+messagebox = LazyModule("tkinter.messagebox")
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Frames read per block when analysing audio (bounds memory per file)
+ANALYSIS_BLOCK_FRAMES = 16384
+
+# Worker processes used to analyse files (None = one per CPU core, 1 = no pool)
+ANALYSIS_WORKERS = None
+# How the analysis worker processes are started. Analysis runs in a worker
+# thread while Tk runs on the main thread, and forking a multi-threaded
+# process is unsafe, so the workers start as fresh interpreters.
+ANALYSIS_START_METHOD = "spawn"
+
+# Conversion jobs (dualmono to mono, L/R to stereo) run at the same time.
+# Jobs are mostly I/O and libsndfile encoding, which releases the GIL.
+CONVERSION_WORKERS = 4
+
+# Sidecar index of analysis results kept in the project root
+ANALYSIS_CACHE_FILE = ".aps_analysis_cache.json"
+ANALYSIS_CACHE_VERSION = 1
+ANALYSIS_CACHE_MAX_ENTRIES = 20000
+# Seconds between saves of the cache during a scan, so an interrupted scan keeps its results
+ANALYSIS_CACHE_SAVE_SECONDS = 10
+# Bytes hashed at each end of a file for its content fingerprint
+FINGERPRINT_BYTES = 65536
+
+# Append-only journal of the file operations of a run, kept in the project
+# root until the run finishes: if it exists, a run was interrupted
+JOURNAL_FILE = ".aps_journal.jsonl"
+
+# Files APS itself keeps in the project (never treated as hidden/temporary files)
+APS_SIDECAR_FILES = {ANALYSIS_CACHE_FILE, JOURNAL_FILE}
+
+# Marks the hidden temporary files outputs are written to (see get_temp_output_path)
+TEMP_OUTPUT_MARKER = ".aps-"
+
+# Labels identification adds to file names ("Kick (mono).wav"): labeled files are not analysed again
+AUDIO_TYPE_LABELS = ("(mono)", "(stereo)", "(dualmono)", "(unknown)")
+
+# Write the mono version of dualmono/silent-channel candidates while analysing,
+# so files that get converted are read from disk only once
+CAPTURE_MONO_DURING_ANALYSIS = True
+
+# Mono versions captured during analysis that wait for the dualmono
+# conversion step: {dualmono file path: captured mono temp path}
+_prepared_mono_files = {}
+
+# Milliseconds between progress window repaints. Work runs in a worker
+# thread that queues its progress events; the window applies them in batches.
+PROGRESS_REFRESH_MS = 100
+
+# Lines kept in the progress window's activity log (older lines are dropped)
+PROGRESS_LOG_MAX_LINES = 1000
+# File that receives the complete activity log as well (None = not saved)
+PROGRESS_LOG_FILE = None
+
+# Report of where the time of a run goes (see RunProfiler), written when the
+# run ends: CSV if the name ends in .csv, JSON otherwise. None = not profiled.
+# The GUI takes it from the APS_PROFILE environment variable.
+PROFILE_REPORT_FILE = os.environ.get("APS_PROFILE") or None
+
+# Folder where processed originals are kept
+OBSOLETE_FOLDER_NAME = "-- OBSOLETE FILES"
+
+# Header information of an audio file (no sample data needed)
+AudioInfo = namedtuple('AudioInfo', ['channels', 'frames', 'samplerate', 'subtype'])
+
+# Header info memoised for the current run: {file path: AudioInfo}
+_audio_info_cache = {}
+
+# Snapshots of the project trees being processed: {absolute folder: ProjectSnapshot}
+_project_snapshots = {}
+
+# Journal of the run in progress (see start_journal)
+_active_journal = None
+
+# Profiler of the run in progress, or None when not profiling (see start_profiling)
+_active_profiler = None
+
+# Folders whose new entries (generated files) are not yet flushed to disk (see sync_written_files)
+_unsynced_folders = set()
+_unsynced_folders_lock = threading.Lock()
+
+# One lock per OBSOLETE FILES folder, so concurrent jobs never race on it
+_obsolete_folder_locks = {}
+_obsolete_folder_locks_guard = threading.Lock()
+
+# Dtype used to read each subtype in its native width. PCM is read as
+# integers so channels can be compared bit-exactly; anything else (float
+# or compressed subtypes) falls back to float.
+NATIVE_DTYPES = {
+    'PCM_S8': 'int16',
+    'PCM_U8': 'int16',
+    'PCM_16': 'int16',
+    'PCM_24': 'int32',
+    'PCM_32': 'int32',
+    'FLOAT': 'float32',
+    'DOUBLE': 'float64',
+}
+
+# Subtypes that can be widened into one another without losing precision,
+# narrowest first: an L/R pair of mixed widths is merged at the wider one
+WIDENING_SUBTYPES = [
+    ['PCM_S8', 'PCM_U8', 'PCM_16', 'PCM_24', 'PCM_32'],
+    ['FLOAT', 'DOUBLE'],
+]
+
+# Silence/equality tolerance for float data (integer data is compared exactly)
+FLOAT_TOLERANCE = 1e-10
+
+# WAV format codes understood by the memory-mapped PCM engine
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# Tail shared by the KSDATAFORMAT_SUBTYPE_* GUIDs of WAVE_FORMAT_EXTENSIBLE
+EXTENSIBLE_GUID_TAIL = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+
+# Sample layout of the memory-mapped engine: (format, bits) -> (sample dtype, silence value).
+# 24-bit samples are kept packed as 3 raw bytes, which is enough to test
+# silence and equality without unpacking them.
+PCM_SAMPLE_LAYOUTS = {
+    (WAVE_FORMAT_PCM, 8): ('u1', 128),
+    (WAVE_FORMAT_PCM, 16): ('<i2', 0),
+    (WAVE_FORMAT_PCM, 24): (('u1', (3,)), 0),
+    (WAVE_FORMAT_PCM, 32): ('<i4', 0),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): ('<f4', 0),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): ('<f8', 0),
+}
+
+# Tokens of an L/R file name: stem, side marker (after a separator, common
+# misspellings included), optional "(tags)" and extension.
+# "Gtr_L (mono).wav" -> stem "Gtr", side "L", tags " (mono)"
+LR_NAME_PATTERN = re.compile(
+    r'^(?P<stem>.*?\S)(?:[\s_.-]+(?P<side>left|right|rigth|rigt|righ|l|r))?'
+    r'(?P<tags>(?:\s*\([^()]*\))*)\.(?P<ext>\w+)$', re.IGNORECASE)
+LR_SIDE_MARKERS = {'l': 'L', 'left': 'L', 'r': 'R', 'right': 'R', 'rigth': 'R', 'rigt': 'R', 'righ': 'R'}
+
+# Status of an L/R pair found by validate_LR_pair (from the headers only)
+LR_PAIR_CLEAN = "clean"
+LR_PAIR_NEEDS_MONO = "needs-mono-conversion"  # A side is a dualmono file
+LR_PAIR_LENGTH_MISMATCH = "length-mismatch"  # Merged up to the shorter file
+LR_PAIR_INCOMPATIBLE = "incompatible"  # Never merged
+
+def get_native_dtype(subtype):
+    """
+    Get the dtype that reads a subtype without widening it.
+
+    Args:
+        subtype: soundfile subtype name (e.g. 'PCM_24')
+
+    Returns:
+        str: 'int16', 'int32', 'float32' or 'float64'
+    """
+    return NATIVE_DTYPES.get(subtype, 'float64')
+
+def get_common_dtype(*subtypes):
+    """
+    Get a single dtype able to read all the given subtypes at full precision.
+    """
+    dtypes = {get_native_dtype(subtype) for subtype in subtypes}
+    if len(dtypes) == 1:
+        return dtypes.pop()
+    if dtypes <= {'int16', 'int32'}:
+        return 'int32'  # libsndfile scales every PCM width to full-range int32
+    return 'float64'
+
+def get_common_subtype(*subtypes):
+    """
+    Get the subtype able to store the samples of all the given subtypes
+    (the widest of them), or None if they cannot be mixed losslessly
+    (e.g. PCM and float).
+    """
+    if len(set(subtypes)) == 1:
+        return subtypes[0]
+    for family in WIDENING_SUBTYPES:
+        if all(subtype in family for subtype in subtypes):
+            return max(subtypes, key=family.index)
+    return None
+
+def get_tolerance(dtype):
+    """
+    Get the silence/equality tolerance for data read with the given dtype.
+    Integer PCM is compared exactly (tolerance 0).
+    """
+    return FLOAT_TOLERANCE if np.dtype(dtype).kind == 'f' else 0
+
+def is_silent(channel, tolerance=0, silence_value=0):
+    if tolerance:
+        return bool(np.all(np.abs(channel) < tolerance))
+    if silence_value:
+        return bool(np.all(channel == silence_value))  # e.g. unsigned 8-bit PCM
+    return not channel.any()
+
+def channels_equal(left_channel, right_channel, tolerance=0):
+    if tolerance:
+        return bool(np.all(np.abs(left_channel - right_channel) < tolerance))
+    return np.array_equal(left_channel, right_channel)
+
+def is_hidden_file(file_name):
+    """
+    Check if a file is a hidden/temporary file (starting with '.').
+    APS's own sidecar files are not considered hidden files.
+    """
+    return file_name.startswith(".") and file_name not in APS_SIDECAR_FILES
+
+def is_labeled_file(file_name):
+    return any(label in file_name for label in AUDIO_TYPE_LABELS)
+
+def is_temp_output_file(file_name):
+    """Check if a file is a temporary output file of APS (e.g. left by an interrupted run)."""
+    return file_name.startswith(".") and TEMP_OUTPUT_MARKER in file_name
+
+def get_audio_info(file_path):
+    """
+    Get the header information of an audio file.
+
+    The header is read once per file per run; later calls (from any stage)
+    are answered from memory, so checks like the channel count never touch
+    sample data.
+
+    Args:
+        file_path: Path to the audio file
+
+    Returns:
+        AudioInfo: channels, frames, samplerate and subtype
+    """
+    audio_info = _audio_info_cache.get(file_path)
+    if audio_info is None:
+        file_info = sf.info(file_path)
+        audio_info = AudioInfo(file_info.channels, file_info.frames, file_info.samplerate, file_info.subtype)
+        _audio_info_cache[file_path] = audio_info
+    return audio_info
+
+def remember_audio_info(file_path, info):
+    """Store header info obtained elsewhere (e.g. by an analysis worker) as a dict."""
+    if info:
+        _audio_info_cache[file_path] = AudioInfo(**info)
+
+def forget_audio_info(file_path):
+    _audio_info_cache.pop(file_path, None)
+
+class ProjectSnapshot:
+    """
+    Listing of a project tree with the stat info of every file, built with a
+    single os.scandir pass.
+
+    APS updates it in place whenever it creates, renames, moves or deletes a
+    file (see record_file_change), so the pipeline stages query it instead of
+    walking the tree again, which is slow on network shares.
+    """
+    def __init__(self, folder):
+        self.folder = os.path.dirname(os.path.join(folder, ''))  # Without trailing separator
+        self.directories = {}  # {directory path: {file name: os.stat_result}}
+        self.lock = threading.Lock()
+        self.scan()
+
+    def scan(self):
+        directories = {}
+        pending = [self.folder]
+        while pending:
+            directory = pending.pop()
+            files = {}
+            subfolders = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subfolders.append(entry.path)
+                            elif entry.is_file():
+                                files[entry.name] = entry.stat()
+                        except OSError:
+                            pass  # Entry removed or unreadable while scanning
+            except OSError as e:
+                print(f"Error scanning folder {directory}: {e}")
+            directories[directory] = files
+            pending.extend(sorted(subfolders, reverse=True))
+        self.directories = directories
+
+    def contains(self, path):
+        return path == self.folder or path.startswith(os.path.join(self.folder, ''))
+
+    def walk(self):
+        """
+        Returns:
+            list: (directory, sorted file names) for every folder, top-down in
+            sorted order like a sorted os.walk
+        """
+        with self.lock:
+            listing = [(directory, sorted(files)) for directory, files in self.directories.items()]
+        listing.sort(key=lambda item: [] if item[0] == self.folder
+                     else os.path.relpath(item[0], self.folder).split(os.sep))
+        return listing
+
+    def list_files(self, directory=None):
+        """Sorted names of the files in a folder (the project root by default)."""
+        with self.lock:
+            return sorted(self.directories.get(directory or self.folder, {}))
+
+    def stat(self, path):
+        """Stat info of a file, or None if the snapshot has no such file."""
+        directory, name = os.path.split(path)
+        with self.lock:
+            return self.directories.get(directory, {}).get(name)
+
+    def add_file(self, path, stat=None):
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return
+        directory, name = os.path.split(path)
+        with self.lock:
+            self.directories.setdefault(directory, {})[name] = stat
+
+    def remove_file(self, path):
+        directory, name = os.path.split(path)
+        with self.lock:
+            return self.directories.get(directory, {}).pop(name, None)
+
+def get_snapshot(folder, rescan=False):
+    """
+    Get the snapshot of a project tree, scanning it on first use.
+
+    Args:
+        folder: Project folder
+        rescan: Scan the tree again (at the start of a run)
+    """
+    key = os.path.abspath(folder)
+    snapshot = _project_snapshots.get(key)
+    if snapshot is None or rescan:
+        started = time.perf_counter()
+        snapshot = ProjectSnapshot(folder)
+        _project_snapshots[key] = snapshot
+        if _active_profiler:
+            profile_operation('project_scan', started,
+                              [os.path.join(directory, file) for directory, files in snapshot.walk() for file in files])
+    return snapshot
+
+def find_snapshot(path):
+    """Return the snapshot that tracks a path, or None."""
+    for snapshot in list(_project_snapshots.values()):
+        if snapshot.contains(path):
+            return snapshot
+    return None
+
+def get_file_stat(path):
+    """Stat info of a file (None if missing), from its project snapshot when there is one."""
+    snapshot = find_snapshot(path)
+    if snapshot:
+        return snapshot.stat(path)
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def file_exists(path):
+    return get_file_stat(path) is not None
+
+def record_file_change(old_path=None, new_path=None):
+    """
+    Update the project snapshots after APS changed a file: old_path was
+    removed (or moved away) and/or new_path was created (or moved in).
+    """
+    stat = None
+    if old_path:
+        snapshot = find_snapshot(old_path)
+        if snapshot:
+            stat = snapshot.remove_file(old_path)
+    if new_path:
+        snapshot = find_snapshot(new_path)
+        if snapshot:
+            snapshot.add_file(new_path, stat)
+
+class OperationJournal:
+    """
+    Append-only record of the file operations of a run, one JSON object per
+    line. Each operation is written before it runs and marked done right
+    after, so after a crash the journal tells which operations may be
+    half-finished. Paths are stored relative to the project folder.
+
+    Operations: 'rename' and 'move' (source -> target), 'create' (target is
+    a generated file) and 'delete' (source). An operation that raised an
+    error is marked failed instead of done and is ignored on recovery.
+    """
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, JOURNAL_FILE)
+        self.lock = threading.Lock()
+        self.file = None
+        self.next_id = max((operation['id'] for operation in self.load()), default=0) + 1
+
+    def contains(self, path):
+        return bool(path) and path.startswith(os.path.join(self.folder, ''))
+
+    def relative(self, path):
+        return os.path.relpath(path, self.folder).replace(os.sep, '/') if path else None
+
+    def absolute(self, path):
+        return os.path.join(self.folder, *path.split('/')) if path else None
+
+    def load(self):
+        """
+        Returns:
+            list: The journaled operations in order, as dicts with 'id', 'op',
+            'source' and 'target' (full paths or None) and 'done'
+        """
+        operations = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Line cut short by a crash
+                    if 'op' in record:
+                        operations[record['id']] = {'id': record['id'], 'op': record['op'], 'done': False,
+                                                    'source': self.absolute(record.get('source')),
+                                                    'target': self.absolute(record.get('target'))}
+                    elif record.get('failed'):
+                        operations.pop(record.get('id'), None)  # Raised an error before changing anything
+                    elif record.get('id') in operations:
+                        operations[record['id']]['done'] = True
+        except OSError:
+            pass
+        return list(operations.values())
+
+    def write(self, record):
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+            if self.file.tell():
+                # Never append to a line left unfinished by a crash
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self.file.write('\n')
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def record(self, op, source=None, target=None):
+        """Write an operation before it runs. Returns its id."""
+        with self.lock:
+            entry_id = self.next_id
+            self.next_id += 1
+            self.write({'id': entry_id, 'op': op, 'source': self.relative(source), 'target': self.relative(target)})
+        return entry_id
+
+    def complete(self, entry_id, failed=False):
+        with self.lock:
+            self.write({'id': entry_id, 'failed': True} if failed else {'id': entry_id, 'done': True})
+
+    def close(self, remove=False):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+def start_journal(folder):
+    """Journal every file operation APS makes in the folder from now on."""
+    global _active_journal
+    _active_journal = OperationJournal(folder)
+    return _active_journal
+
+def finish_journal():
+    """The run completed: nothing to recover, so the journal is deleted."""
+    global _active_journal
+    if _active_journal:
+        _active_journal.close(remove=True)
+        _active_journal = None
+
+def has_unfinished_run(folder):
+    return os.path.exists(os.path.join(folder, JOURNAL_FILE))
+
+@contextlib.contextmanager
+def journaled(op, source=None, target=None):
+    """
+    Journal the file operation done in the with-block: it is recorded before
+    the block runs and marked done when the block completes.
+    """
+    journal = _active_journal
+    if journal is None or not journal.contains(source or target):
+        yield
+        return
+    entry_id = journal.record(op, source, target)
+    try:
+        yield
+    except BaseException:
+        journal.complete(entry_id, failed=True)  # It did not happen: nothing to resume or undo
+        raise
+    journal.complete(entry_id)
+
+def resume_journal(folder):
+    """
+    Finish the operations an interrupted run left pending, in one pass over
+    its journal: interrupted renames/moves are completed. Generated files
+    need nothing: they get their final name atomically once complete (see
+    atomic_output), so any that exists is whole; unfinished temporary
+    outputs are removed. No audio is read.
+
+    Returns:
+        list: A message for each operation that needed attention
+    """
+    journal = OperationJournal(folder)
+    messages = []
+    for operation in journal.load():
+        if operation['done']:
+            continue
+        source, target = operation['source'], operation['target']
+        try:
+            if operation['op'] in ('rename', 'move'):
+                if os.path.exists(target):
+                    continue  # It did happen before the crash
+                if os.path.exists(source):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(source, target)
+                    messages.append(f"Completed {operation['op']}: {journal.relative(source)} -> {journal.relative(target)}")
+                else:
+                    messages.append(f"Missing file, not {operation['op']}d: {journal.relative(source)}")
+            elif operation['op'] == 'delete':
+                if os.path.exists(source):
+                    os.remove(source)
+                    messages.append(f"Completed delete: {journal.relative(source)}")
+        except OSError as e:
+            messages.append(f"Error recovering {journal.relative(source or target)}: {e}")
+    messages.extend(remove_temp_output_files(folder))
+    journal.close(remove=True)
+    return messages
+
+def rollback_journal(folder):
+    """
+    Undo the operations of an interrupted run, newest first: renamed and
+    moved files go back to their original names and generated files (and
+    unfinished temporary outputs) are removed. Deleted files cannot be
+    restored. No audio is read.
+
+    Returns:
+        list: A message for each operation undone (or that could not be)
+    """
+    journal = OperationJournal(folder)
+    messages = []
+    for operation in reversed(journal.load()):
+        source, target = operation['source'], operation['target']
+        try:
+            if operation['op'] in ('rename', 'move'):
+                if os.path.exists(target) and not os.path.exists(source):
+                    os.makedirs(os.path.dirname(source), exist_ok=True)
+                    os.replace(target, source)
+                    messages.append(f"Restored: {journal.relative(target)} -> {journal.relative(source)}")
+            elif operation['op'] == 'create':
+                if os.path.exists(target):
+                    os.remove(target)
+                    messages.append(f"Removed generated file: {journal.relative(target)}")
+            elif operation['op'] == 'delete':
+                if operation['done']:
+                    messages.append(f"Deleted file cannot be restored: {journal.relative(source)}")
+        except OSError as e:
+            messages.append(f"Error restoring {journal.relative(source or target)}: {e}")
+    messages.extend(remove_temp_output_files(folder))
+    journal.close(remove=True)
+    return messages
+
+def remove_temp_output_files(folder):
+    """
+    Delete the temporary output files an interrupted run left in the project.
+    They are never complete outputs: those always get their final name.
+
+    Returns:
+        list: A message for each file removed (or that could not be)
+    """
+    messages = []
+    for root_dir, _, files in os.walk(folder):  # Runs before the project snapshot is taken
+        for file in files:
+            if is_temp_output_file(file):
+                file_path = os.path.join(root_dir, file)
+                try:
+                    os.remove(file_path)
+                    messages.append(f"Removed unfinished output: {os.path.relpath(file_path, folder)}")
+                except OSError as e:
+                    messages.append(f"Error removing unfinished output {os.path.relpath(file_path, folder)}: {e}")
+    return messages
+
+class RunProfiler:
+    """
+    Wall time, bytes read and written and files touched during a run, per
+    stage of the pipeline and per kind of file operation.
+
+    Operations may be counted from any thread. Their bytes and files also
+    add up in every stage open at the time. In the GUI, the time of a stage
+    includes the time its dialogs wait for the user.
+    """
+    FIELDS = ['kind', 'name', 'calls', 'seconds', 'files', 'bytes_read', 'bytes_written', 'mb_per_second']
+
+    def __init__(self, folder, report_path):
+        self.folder = folder
+        self.report_path = report_path
+        self.start_time = time.perf_counter()
+        self.total = self.new_record('run', 'total')
+        self.stages = []  # In the order they ran
+        self.open_stages = []
+        self.operations = {}  # {operation name: record}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def new_record(kind, name):
+        return {'kind': kind, 'name': name, 'calls': 0, 'seconds': 0.0, 'paths': set(),
+                'bytes_read': 0, 'bytes_written': 0}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        record = self.new_record('stage', name)
+        record['calls'] = 1
+        with self.lock:
+            self.stages.append(record)
+            self.open_stages.append(record)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            with self.lock:
+                self.open_stages.remove(record)
+
+    def count(self, name, seconds, files=(), bytes_read=0, bytes_written=0):
+        with self.lock:
+            record = self.operations.get(name)
+            if record is None:
+                record = self.operations[name] = self.new_record('operation', name)
+            record['calls'] += 1
+            record['seconds'] += seconds
+            for target in [record, self.total] + self.open_stages:
+                target['paths'].update(files)
+                target['bytes_read'] += bytes_read
+                target['bytes_written'] += bytes_written
+
+    def records(self):
+        """All the records of the report (run total, stages, operations) as flat dicts."""
+        self.total['calls'] = 1
+        self.total['seconds'] = time.perf_counter() - self.start_time
+        rows = []
+        with self.lock:
+            for record in [self.total] + self.stages + sorted(self.operations.values(), key=lambda r: -r['seconds']):
+                row = {field: record.get(field) for field in self.FIELDS}
+                row['seconds'] = round(record['seconds'], 6)
+                row['files'] = len(record['paths'])
+                megabytes = (record['bytes_read'] + record['bytes_written']) / 1e6
+                row['mb_per_second'] = round(megabytes / record['seconds'], 3) if record['seconds'] > 0 else None
+                rows.append(row)
+        return rows
+
+    def save(self):
+        """
+        Write the report (CSV or JSON, by the extension of report_path) and
+        print the time of each stage.
+
+        Returns:
+            str: The report path, or None if it could not be written
+        """
+        rows = self.records()
+        for row in rows:
+            if row['kind'] != 'operation':
+                print(f"{row['name']}: {row['seconds']:.3f}s, {row['files']} files, "
+                      f"{row['bytes_read'] / 1e6:.1f} MB read, {row['bytes_written'] / 1e6:.1f} MB written")
+        try:
+            with open(self.report_path, 'w', encoding='utf-8', newline='') as f:
+                if self.report_path.lower().endswith('.csv'):
+                    writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                    writer.writeheader()
+                    writer.writerows(rows)
+                else:
+                    json.dump({'project': os.path.abspath(self.folder),
+                               'total': rows[0],
+                               'stages': [row for row in rows if row['kind'] == 'stage'],
+                               'operations': [row for row in rows if row['kind'] == 'operation']}, f, indent=2)
+        except OSError as e:
+            print(f"Error saving profile report: {e}")
+            return None
+        print(f"Profile report saved: {self.report_path}")
+        return self.report_path
+
+def start_profiling(folder, report_path):
+    """Profile the run from now on; the report is written by finish_profiling."""
+    global _active_profiler
+    _active_profiler = RunProfiler(folder, report_path)
+    return _active_profiler
+
+def finish_profiling():
+    """
+    Returns:
+        str: Path of the report written, or None if the run was not profiled
+    """
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    return profiler.save() if profiler else None
+
+def profile_stage(name):
+    """Time the with-block as a stage of the run (does nothing when not profiling)."""
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.stage(name)
+
+def profile_operation(name, started, files=(), read_files=(), written_files=()):
+    """
+    Count one file operation for the run profile. Does nothing when not
+    profiling, so callers only pay for the time.perf_counter() call giving
+    `started`. The sizes of read_files and written_files count as bytes
+    read and written; files (and those two) as the files touched.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return
+    seconds = time.perf_counter() - started
+    profiler.count(name, seconds, [*files, *read_files, *written_files],
+                   sum(get_file_size(path) for path in read_files),
+                   sum(get_file_size(path) for path in written_files))
+
+def get_file_size(path):
+    """Size in bytes of a file (0 if missing), from its project snapshot when there is one."""
+    stat = get_file_stat(path)
+    if stat is None:
+        try:
+            stat = os.stat(path)  # Temporary files are not in the snapshot
+        except OSError:
+            return 0
+    return stat.st_size
+
+def rename_file(old_path, new_path):
+    """Rename a file, keeping its memoised header info and snapshot entry."""
+    started = time.perf_counter()
+    with journaled('rename', old_path, new_path):
+        os.rename(old_path, new_path)
+    record_file_change(old_path, new_path)
+    profile_operation('rename_file', started, [old_path])
+    audio_info = _audio_info_cache.pop(old_path, None)
+    if audio_info:
+        _audio_info_cache[new_path] = audio_info
+
+def move_to_obsolete(file_path, folder=None):
+    """
+    Move a processed original file to the OBSOLETE FILES folder.
+
+    Args:
+        file_path: File to move
+        folder: Folder holding the OBSOLETE FILES folder (default: the file's own folder)
+
+    Returns:
+        str: The new path of the file
+    """
+    started = time.perf_counter()
+    obsolete_folder_path = os.path.join(folder or os.path.dirname(file_path), OBSOLETE_FOLDER_NAME)
+    with _obsolete_folder_locks_guard:
+        folder_lock = _obsolete_folder_locks.setdefault(obsolete_folder_path, threading.Lock())
+
+    with folder_lock:
+        os.makedirs(obsolete_folder_path, exist_ok=True)
+        # Never overwrite an older original with the same name
+        name, ext = os.path.splitext(os.path.basename(file_path))
+        new_path = os.path.join(obsolete_folder_path, name + ext)
+        copy_number = 2
+        while os.path.exists(new_path):
+            new_path = os.path.join(obsolete_folder_path, f"{name} ({copy_number}){ext}")
+            copy_number += 1
+        with journaled('move', file_path, new_path):
+            shutil.move(file_path, new_path)
+    record_file_change(file_path, new_path)
+    forget_audio_info(file_path)
+    profile_operation('move_to_obsolete', started, [file_path])
+    return new_path
+
+def get_temp_output_path(final_path, tag="tmp"):
+    """
+    Get the hidden temporary path, in the same folder, used while an output
+    file is being written. Hidden names are skipped by every scan. The
+    process and thread ids make it unique to the writer, so two writers of
+    the same output never share a temporary file.
+    """
+    folder, name = os.path.split(final_path)
+    stem, ext = os.path.splitext(name)
+    return os.path.join(folder, f".{stem}{TEMP_OUTPUT_MARKER}{tag}-{os.getpid()}-{threading.get_ident()}{ext}")
+
+def rename_no_replace(source, target):
+    """
+    Rename a file, raising FileExistsError instead of replacing an existing
+    target. Atomic where the filesystem supports hard links (and on Windows,
+    whose rename never replaces).
+    """
+    if os.name == 'nt':
+        os.rename(source, target)
+        return
+    try:
+        os.link(source, target)  # Fails if the target exists
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links on this filesystem (e.g. exFAT): check, then rename
+        if os.path.exists(target):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), target)
+        os.rename(source, target)
+        return
+    os.remove(source)
+
+def commit_output(temp_path, final_path):
+    """
+    Give a completely written temporary file its final name. Its data is
+    flushed to disk first and the rename is atomic, so the final name never
+    refers to a partial file, not even after a power loss. The rename never
+    replaces an existing file: FileExistsError is raised instead. The
+    temporary file is removed if it cannot be committed.
+    """
+    started = time.perf_counter()
+    try:
+        flush_file(temp_path)
+        if os.path.exists(final_path):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), final_path)
+        with journaled('create', target=final_path):
+            rename_no_replace(temp_path, final_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    record_file_change(new_path=final_path)
+    profile_operation('commit_output', started, [final_path])
+    with _unsynced_folders_lock:
+        _unsynced_folders.add(os.path.dirname(final_path))
+
+def flush_file(path):
+    """Flush the data of a written file to disk."""
+    fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+    try:
+        if hasattr(os, 'fdatasync'):
+            os.fdatasync(fd)
+        else:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def atomic_output(final_path):
+    """
+    Write a generated file under a hidden temporary name in the same folder
+    (the path yielded) and rename it into place only when the with-block
+    completes. On error the temporary file is removed and nothing appears
+    under the final name.
+    """
+    temp_path = get_temp_output_path(final_path, "write")
+    try:
+        yield temp_path
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    commit_output(temp_path, final_path)
+
+def sync_written_files():
+    """
+    Flush the folders that received generated files since the last call,
+    once per folder at the end of a batch, so the new names survive a power
+    loss. The data of every file was already flushed before its rename (see
+    commit_output).
+    """
+    with _unsynced_folders_lock:
+        folders = sorted(_unsynced_folders)
+        _unsynced_folders.clear()
+    if os.name == 'nt':
+        return  # Folders cannot be flushed on Windows (NTFS journals the renames)
+    for folder in folders:
+        try:
+            fd = os.open(folder, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass  # Folder removed, or a filesystem that cannot flush folders
+
+def discard_prepared_mono_files():
+    """Delete the mono versions captured for dualmono files that were not converted."""
+    for prepared_file in _prepared_mono_files.values():
+        try:
+            os.remove(prepared_file)
+        except OSError:
+            pass
+    _prepared_mono_files.clear()
 
 def get_operating_system():
     """
@@ -21,6 +944,92 @@ def get_operating_system():
     return system
 
 
+# The application's only Tk root; every window is a Toplevel of it
+_tk_root = None
+
+def get_tk_root():
+    """Return the hidden Tk root shared by all windows, creating it on first use."""
+    global _tk_root
+    if _tk_root is None:
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+    return _tk_root
+
+def ask_selection(title, prompt, labels, preselected=None):
+    """
+    Show a list of items, all selected by default, and wait until the user
+    confirms the selection. Shared by the dualmono and L/R pickers.
+
+    Args:
+        title: Window title
+        prompt: Text shown above the list
+        labels: Text of each item
+        preselected: Indices selected initially (default: all)
+
+    Returns:
+        list: Indices of the selected items (empty if the window is closed)
+    """
+    window = tk.Toplevel(get_tk_root())
+    window.title(title)
+
+    main_frame = tk.Frame(window)
+    main_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+    label = tk.Label(main_frame, text=prompt, font=('Arial', 10))
+    label.pack(pady=5)
+
+    list_frame = tk.Frame(main_frame)
+    list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    scrollbar = tk.Scrollbar(list_frame)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    listbox = tk.Listbox(list_frame, selectmode=tk.MULTIPLE,
+                        yscrollcommand=scrollbar.set,
+                        height=min(10, len(labels)),
+                        width=70,
+                        font=('Arial', 10))
+    scrollbar.config(command=listbox.yview)
+    listbox.insert(tk.END, *labels)
+
+    # Select all items by default
+    if preselected is None:
+        listbox.selection_set(0, tk.END)
+    else:
+        for index in preselected:
+            listbox.selection_set(index)
+    listbox.pack(fill=tk.BOTH, expand=True)
+
+    # Selection buttons frame
+    btn_frame = tk.Frame(main_frame)
+    btn_frame.pack(pady=5)
+
+    select_all_btn = tk.Button(btn_frame, text="Select All",
+                             command=lambda: listbox.selection_set(0, tk.END))
+    select_all_btn.pack(side=tk.LEFT, padx=5)
+
+    deselect_all_btn = tk.Button(btn_frame, text="Deselect All",
+                               command=lambda: listbox.selection_clear(0, tk.END))
+    deselect_all_btn.pack(side=tk.LEFT, padx=5)
+
+    selected_indices = []
+
+    def on_ok():
+        selected_indices.extend(listbox.curselection())
+        window.destroy()
+
+    ok_btn = tk.Button(main_frame, text="OK", command=on_ok)
+    ok_btn.pack(pady=5)
+
+    # Set window size and center
+    x = (window.winfo_screenwidth() // 2) - 200
+    y = (window.winfo_screenheight() // 2) - 150
+    window.geometry(f'400x300+{x}+{y}')
+    window.focus_force()
+
+    window.wait_window()  # Returns once the window is destroyed
+    return selected_indices
+
 class FileOrdererApp:
     def __init__(self, folder):
         self.folder = folder
@@ -36,12 +1045,15 @@ class FileOrdererApp:
         self.create_widgets()
 
     def populate_files(self):
-        self.files = [os.path.join(self.folder, f) for f in os.listdir(self.folder) if os.path.isfile(os.path.join(self.folder, f)) and not f.startswith(".")]
+        self.files = [os.path.join(self.folder, f) for f in get_snapshot(self.folder).list_files() if not f.startswith(".")]
         self.elements.extend(self.files)
         self.elements.extend(self.categories)
+        # Row text and category status are worked out once, not on every redraw
+        self.category_set = set(self.categories)
+        self.labels = {item: item if item in self.category_set else os.path.basename(item) for item in self.elements}
 
     def create_widgets(self):
-        self.root = tk.Tk()
+        self.root = tk.Toplevel(get_tk_root())
 
         self.listbox_frame = tk.Frame(self.root)
         self.listbox_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -54,13 +1066,7 @@ class FileOrdererApp:
 
         self.listbox.config(yscrollcommand=self.scrollbar.set)
 
-        for item in self.elements:
-            if item in self.categories:
-                fg_color, bg_color = self.category_colors[item]
-                self.listbox.insert(tk.END, item)
-                self.listbox.itemconfig(tk.END, {'fg': fg_color, 'bg': bg_color})
-            else:
-                self.listbox.insert(tk.END, os.path.basename(item) if os.path.isfile(item) else item)
+        self.update_listbox()
 
         self.rename_button = tk.Button(self.root, text="OK", command=self.rename_files)
         self.rename_button.pack(pady=5)
@@ -81,15 +1087,20 @@ class FileOrdererApp:
         if dragged_index is None:
             return
 
-        if self.elements[dragged_index] in self.categories:
+        if self.elements[dragged_index] in self.category_set:
             return
 
         widget = event.widget
         current_index = widget.nearest(event.y)
 
         if current_index != dragged_index:
-            self.elements.insert(current_index, self.elements.pop(dragged_index))
-            self.update_listbox()
+            # Move only the dragged row (a file, so it has no colours to restore)
+            item = self.elements.pop(dragged_index)
+            self.elements.insert(current_index, item)
+            self.listbox.delete(dragged_index)
+            self.listbox.insert(current_index, self.labels[item])
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(current_index)
             self.drag_data["index"] = current_index
 
 
@@ -99,39 +1110,68 @@ class FileOrdererApp:
     def update_listbox(self):
         self.listbox.delete(0, tk.END)
         for item in self.elements:
-            if item in self.categories:
+            self.listbox.insert(tk.END, self.labels[item])
+            if item in self.category_set:
                 fg_color, bg_color = self.category_colors[item]
-                self.listbox.insert(tk.END, item)
                 self.listbox.itemconfig(tk.END, {'fg': fg_color, 'bg': bg_color})
+
+    def plan_renames(self):
+        """
+        Work out every rename in one pass over self.elements: each file goes
+        to the folder of the nearest category above it (files above all
+        categories stay in the project root), numbered after the files that
+        folder already holds.
+
+        Returns:
+            tuple: (list of (old path, new path), list of collision messages)
+        """
+        snapshot = get_snapshot(self.folder)
+        category_folder = None
+        categorized_renames = []
+        uncategorized_files = []
+        next_numbers = {}  # {category folder: next file number}
+        for item in self.elements:
+            if item in self.category_set:
+                category_folder = os.path.join(self.folder, item)
+            elif category_folder:
+                if category_folder not in next_numbers:
+                    next_numbers[category_folder] = len(snapshot.list_files(category_folder)) + 1
+                new_name = os.path.join(category_folder, f"{next_numbers[category_folder]:02d} - {os.path.basename(item)}")
+                next_numbers[category_folder] += 1
+                categorized_renames.append((item, new_name))
             else:
-                self.listbox.insert(tk.END, os.path.basename(item) if os.path.isfile(item) else item)
+                uncategorized_files.append(item)
+        renames = categorized_renames + [
+            (item, os.path.join(self.folder, f"{i + 1:02d} - {os.path.basename(item)}"))
+            for i, item in enumerate(uncategorized_files)]
+
+        # Never overwrite a file: targets must be new and unique
+        sources = {os.path.normcase(old_path) for old_path, _ in renames}
+        targets = set()
+        collisions = []
+        for old_path, new_path in renames:
+            target = os.path.normcase(new_path)
+            if target in targets or target in sources or file_exists(new_path):
+                collisions.append(f"{os.path.basename(old_path)} -> {os.path.relpath(new_path, self.folder)}")
+            targets.add(target)
+        return renames, collisions
 
     def rename_files(self):
-        uncategorized_files = []
-        for i, item in enumerate(self.elements):
-            if os.path.isfile(item):
-                folder_name = None
-                for category in self.categories:
-                    category_index = self.elements.index(category)
-                    if category_index < i:
-                        folder_name = category
-                if folder_name:
-                    folder_path = os.path.join(self.folder, folder_name)
-                    os.makedirs(folder_path, exist_ok=True)
-                    new_name = os.path.join(folder_path, f"{len(os.listdir(folder_path)) + 1:02d} - {os.path.basename(item)}")
-                    try:
-                        os.rename(item, new_name)
-                    except Exception as e:
-                        print("Error renaming file:", e)
-                else:
-                    uncategorized_files.append(item)
-        for i, item in enumerate(uncategorized_files):
-            new_name = os.path.join(self.folder, f"{i + 1:02d} - {os.path.basename(item)}")
+        renames, collisions = self.plan_renames()
+        if collisions:
+            messagebox.showerror("Files Not Renamed",
+                "Nothing was renamed because these files would overwrite existing ones:\n\n" +
+                "\n".join(collisions[:20]), parent=self.root)
+            return
+
+        for folder_path in {os.path.dirname(new_path) for _, new_path in renames}:
+            os.makedirs(folder_path, exist_ok=True)
+        for old_path, new_path in renames:
             try:
-                os.rename(item, new_name)
+                rename_file(old_path, new_path)
             except Exception as e:
                 print("Error renaming file:", e)
-        self.root.quit()
+        self.root.destroy()
 
     def run(self):
         self.root.title("Reorder Your Tracks. NOTE: You can also leave files out of the categories.")
@@ -142,7 +1182,7 @@ class FileOrdererApp:
         x = (screen_width - window_width) // 2
         y = (screen_height - window_height) // 2
         self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
-        self.root.mainloop()
+        self.root.wait_window()
 
 def select_folder(root):
     folder = filedialog.askdirectory(parent=root, title="Select Folder")
@@ -157,28 +1197,49 @@ def show_donation_dialog(root):
         webbrowser.open("https://ko-fi.com/docshadrach")
 
 def main():
-    # Create single root window and hide it
-    root = tk.Tk()
-    root.withdraw()
+    # Create single root window and hide it (shared by every dialog)
+    root = get_tk_root()
     
     current_directory = os.getcwd()
     folder = select_folder(root)
     if folder:
-        if any(file.startswith(".") for file in os.listdir(folder)):
-            confirm_delete_hidden_files(folder)
+        if PROFILE_REPORT_FILE:
+            start_profiling(folder, PROFILE_REPORT_FILE)
+        if has_unfinished_run(folder):
+            with profile_stage('recovery'):
+                recovered = confirm_recover_unfinished_run(folder)
+            if not recovered:
+                # A new run would add its operations to the unfinished run's journal
+                print("Unfinished run left as it is: the folder was not processed.")
+                finish_profiling()
+                root.destroy()
+                return
+        # Scan the project once; every step below works on this snapshot
+        with profile_stage('project_scan'):
+            snapshot = get_snapshot(folder, rescan=True)
+        start_journal(folder)
+        if any(is_hidden_file(file) for file in snapshot.list_files()):
+            with profile_stage('hidden_file_cleanup'):
+                confirm_delete_hidden_files(folder)
         
         # Get identified dualmono files
-        dualmono_files = confirm_identify_audio_type(folder)
+        with profile_stage('identification'):
+            dualmono_files = confirm_identify_audio_type(folder)
         print(f"Dualmono files found: {dualmono_files}")  # Debug log
         
         # If there are dualmono files, show selection dialog
         if dualmono_files:
             print("Showing dualmono selection dialog...")  # Debug log
-            confirm_convert_dualmono_to_mono(dualmono_files)
+            with profile_stage('dualmono_conversion'):
+                confirm_convert_dualmono_to_mono(dualmono_files)
         
         # Continue with next steps
-        confirm_convert_LR_to_stereo(folder)
-        confirm_reorder_files(folder)
+        with profile_stage('LR_merge'):
+            confirm_convert_LR_to_stereo(folder)
+        with profile_stage('reorder'):
+            confirm_reorder_files(folder)
+        finish_journal()
+        finish_profiling()
         print("Process completed.")
         show_donation_dialog(root)
     else:
@@ -187,230 +1248,501 @@ def main():
     # Clean up
     root.destroy()
 
-def show_dualmono_files(dualmono_files):
-    root = tk.Tk()
-    root.title("Dualmono Files Found")
-    
-    # Main frame
-    main_frame = tk.Frame(root)
-    main_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
-    
-    # Label
-    label = tk.Label(main_frame, text="Select files to convert from dualmono to mono:", font=('Arial', 10))
-    label.pack(pady=5)
-    
-    # Listbox with checkboxes
-    list_frame = tk.Frame(main_frame)
-    list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-    
-    scrollbar = tk.Scrollbar(list_frame)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    
-    listbox = tk.Listbox(list_frame, selectmode=tk.MULTIPLE, 
-                        yscrollcommand=scrollbar.set,
-                        height=min(10, len(dualmono_files)),
-                        width=70,
-                        font=('Arial', 10))
-    scrollbar.config(command=listbox.yview)
-    
-    for file_path in dualmono_files:
-        listbox.insert(tk.END, os.path.basename(file_path).replace('(dualmono).wav', ''))
-    
-    # Select all items by default
-    listbox.selection_set(0, tk.END)
-    
-    listbox.pack(fill=tk.BOTH, expand=True)
-    
-    # Selection buttons frame
-    btn_frame = tk.Frame(main_frame)
-    btn_frame.pack(pady=5)
-    
-    # Select All button
-    select_all_btn = tk.Button(btn_frame, text="Select All", 
-                             command=lambda: listbox.selection_set(0, tk.END))
-    select_all_btn.pack(side=tk.LEFT, padx=5)
-    
-    # Deselect All button
-    deselect_all_btn = tk.Button(btn_frame, text="Deselect All", 
-                               command=lambda: listbox.selection_clear(0, tk.END))
-    deselect_all_btn.pack(side=tk.LEFT, padx=5)
-    
-    # Store selected files
-    selected_files = []
-    
-    # OK button
-    def on_ok():
-        nonlocal selected_files
-        selected_indices = listbox.curselection()
-        selected_files = [dualmono_files[i] for i in selected_indices]
-        print(f"Selected files: {selected_files}")  # Debug log
-        root.quit()  # Only closes mainloop, doesn't destroy window
-    
-    ok_btn = tk.Button(main_frame, text="OK", command=on_ok)
-    ok_btn.pack(pady=5)
-    
+def confirm_recover_unfinished_run(folder):
+    """
+    Offer to resume or roll back a run that was interrupted (see OperationJournal).
 
-    # Set window size and center
-    root.geometry("400x300")
-    root.update_idletasks()
-    width = root.winfo_width()
-    height = root.winfo_height()
-    x = (root.winfo_screenwidth() // 2) - (width // 2)
-    y = (root.winfo_screenheight() // 2) - (height // 2)
-    root.geometry(f'400x300+{x}+{y}')
-    
-    root.mainloop()
-    root.destroy()  # Destroys window after exiting mainloop
+    Returns:
+        bool: True if it was resumed or rolled back, False if the user left it
+        as it is (the folder must not be processed then)
+    """
+    answer = messagebox.askyesnocancel("Unfinished Run",
+        "The last run on this folder did not finish.\n\n"
+        "Yes: complete the file operations it left pending\n"
+        "No: undo every file operation of that run\n"
+        "Cancel: leave the files as they are, without processing the folder", parent=get_tk_root())
+    if answer is None:
+        messagebox.showinfo("Unfinished Run",
+            "The folder was not processed. Open it again to complete or undo the unfinished run first.",
+            parent=get_tk_root())
+        return False
+    messages = resume_journal(folder) if answer else rollback_journal(folder)
+    for message in messages:
+        print(message)
+    messagebox.showinfo("Unfinished Run",
+        ("\n".join(messages[:20]) if messages else "Nothing needed to be changed.") +
+        (f"\n... and {len(messages) - 20} more" if len(messages) > 20 else ""), parent=get_tk_root())
+    return True
+
+def run_headless(folder, identify=False, convert_dualmono=False, merge_LR=False,
+                 delete_hidden=False, workers=ANALYSIS_WORKERS, recover=None, profile_report=PROFILE_REPORT_FILE):
+    """
+    Run the processing pipeline without any dialog (and without importing tkinter).
+
+    Every decision the GUI asks for is taken from the policy flags: each step
+    only runs if its flag is set, and all dualmono files / L/R pairs found are
+    processed. Reordering is interactive only and is not available here.
+
+    recover ('resume' or 'rollback') first deals with an interrupted earlier
+    run using its journal (see resume_journal and rollback_journal). Without
+    it, a folder with an unfinished run is not processed: the summary gets
+    an 'error' instead.
+
+    profile_report is the file that receives the time, bytes and files of
+    each step (see RunProfiler), or None not to profile the run.
+
+    Returns:
+        dict: Machine-readable summary of everything that was done
+    """
+    start_time = time.time()
+    progress_window = ConsoleProgress()
+    summary = {
+        'project': os.path.abspath(folder),
+        'hidden_files_deleted': [],
+        'identified_files': [],
+        'audio_types': {},
+        'mono_files_created': [],
+        'stereo_files_created': [],
+        'recovered_operations': [],
+    }
+    if profile_report:
+        start_profiling(folder, profile_report)
+
+    if recover == 'resume':
+        with profile_stage('recovery'):
+            summary['recovered_operations'] = resume_journal(folder)
+    elif recover == 'rollback':
+        with profile_stage('recovery'):
+            summary['recovered_operations'] = rollback_journal(folder)
+    elif has_unfinished_run(folder):
+        # A new run would add its operations to the unfinished run's journal
+        summary['error'] = "An earlier run did not finish: use --resume or --rollback first"
+        progress_window.add_log(summary['error'])
+        finish_profiling()
+        summary['elapsed_seconds'] = round(time.time() - start_time, 3)
+        return summary
+    with profile_stage('project_scan'):
+        get_snapshot(folder, rescan=True)  # Scan the project once for all the steps
+    start_journal(folder)
+
+    if delete_hidden:
+        with profile_stage('hidden_file_cleanup'):
+            summary['hidden_files_deleted'] = delete_hidden_files(folder)
+
+    dualmono_files = []
+    if identify:
+        if not find_unlabeled_files(folder):
+            progress_window.add_log("Every file is already labeled: skipping identification")
+        else:
+            labeled_files = []
+            with profile_stage('identification'):
+                dualmono_files = identify_audio_type(folder, workers, progress_window, interactive=False,
+                                                     labeled_files=labeled_files)
+            summary['identified_files'] = labeled_files
+            for labeled_file in labeled_files:
+                audio_type = labeled_file['audio_type'] or "error"
+                summary['audio_types'][audio_type] = summary['audio_types'].get(audio_type, 0) + 1
+
+    if convert_dualmono and dualmono_files:
+        with profile_stage('dualmono_conversion'):
+            results = convert_dualmono_to_mono(dualmono_files, True, progress_window=progress_window)
+        summary['mono_files_created'] = [output for output in results if output]
+    discard_prepared_mono_files()
+
+    if merge_LR:
+        with profile_stage('LR_merge'):
+            lr_pairs = pair_LR_files(find_matching_files(folder))
+            results = convert_LR_pairs(lr_pairs, progress_window)
+        summary['stereo_files_created'] = [output for output in results if output]
+
+    finish_journal()
+    report = finish_profiling()
+    if report:
+        summary['profile_report'] = report
+    summary['elapsed_seconds'] = round(time.time() - start_time, 3)
+    return summary
+
+def worker_count(value):
+    """argparse type of --workers: a whole number of at least 1."""
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of workers: {value!r}")
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"at least 1 worker is needed, not {workers}")
+    return workers
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Audio Project Sanitizer. Without arguments the graphical interface is shown.")
+    parser.add_argument("--headless", metavar="PROJECT_FOLDER",
+                        help="process PROJECT_FOLDER without any window (no tkinter needed)")
+    parser.add_argument("--delete-hidden", action="store_true", help="delete hidden files (starting with '.')")
+    parser.add_argument("--identify", action="store_true", help="label files as mono/stereo/dualmono")
+    parser.add_argument("--convert-dualmono", action="store_true", help="convert every dualmono file found to mono")
+    parser.add_argument("--merge-lr", action="store_true", help="merge every L/R pair found into a stereo file")
+    parser.add_argument("--all", action="store_true", help="run every step above")
+    parser.add_argument("--workers", type=worker_count, default=ANALYSIS_WORKERS,
+                        help="analysis worker processes (default: one per CPU core)")
+    parser.add_argument("--summary", metavar="FILE", help="also write the JSON summary to FILE")
+    parser.add_argument("--profile", metavar="FILE", default=PROFILE_REPORT_FILE,
+                        help="write the time, bytes and files of each step to FILE (CSV if it ends in .csv, else JSON)")
+    recovery = parser.add_mutually_exclusive_group()
+    recovery.add_argument("--resume", action="store_true",
+                          help="first complete the file operations an interrupted run left pending")
+    recovery.add_argument("--rollback", action="store_true",
+                          help="first undo the file operations of an interrupted run")
+    return parser.parse_args(argv)
+
+def headless_main(args):
+    """Run the headless mode and print its JSON summary on stdout."""
+    if not os.path.isdir(args.headless):
+        print(f"Project folder not found: {args.headless}", file=sys.stderr)
+        return 2
+
+    # Progress and log messages go to stderr so stdout only carries the summary
+    with contextlib.redirect_stdout(sys.stderr):
+        summary = run_headless(args.headless,
+                               identify=args.identify or args.all,
+                               convert_dualmono=args.convert_dualmono or args.all,
+                               merge_LR=args.merge_lr or args.all,
+                               delete_hidden=args.delete_hidden or args.all,
+                               workers=args.workers,
+                               recover='resume' if args.resume else 'rollback' if args.rollback else None,
+                               profile_report=args.profile)
+
+    summary_text = json.dumps(summary, indent=2)
+    print(summary_text)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(summary_text)
+    return 1 if 'error' in summary else 0
+
+def show_dualmono_files(dualmono_files):
+    labels = [os.path.basename(file_path).replace('(dualmono).wav', '') for file_path in dualmono_files]
+    selected_indices = ask_selection("Dualmono Files Found", "Select files to convert from dualmono to mono:", labels)
+    selected_files = [dualmono_files[i] for i in selected_indices]
     print(f"Returning files: {selected_files}")  # Debug log
     return selected_files
 
-def show_LR_pairs(matching_files):
-    lr_pairs = []
-    for normalized_name, files in matching_files.items():
-        # More flexible detection for left/right files including common misspellings
-        left_files = []
-        right_files = []
-        for file in files:
-            # Check for left indicators (L, left, _L, _left) - case insensitive
-            if re.search(r'(\bL\b|_L\b|\bleft\b|_left\b)', file, re.IGNORECASE):
-                left_files.append(file)
-            # Check for right indicators including misspellings (R, right, _R, _right, rigth, rigt, righ) - case insensitive
-            elif re.search(r'(\bR\b|_R\b|\bright\b|_right\b|\brigth\b|\brigt\b|\brigh\b)', file, re.IGNORECASE):
-                right_files.append(file)
-        
-        if len(left_files) == 1 and len(right_files) == 1:
-            lr_pairs.append((left_files[0], right_files[0]))
+def rank_LR_candidates(matching_files):
+    """
+    List every possible left/right pair of the groups found by
+    find_matching_files, with a score. Groups with more than one file on a
+    side are kept (all their combinations are candidates, marked ambiguous).
 
-    if not lr_pairs:
+    Returns:
+        list: Dicts with 'left', 'right', 'group' (normalised stem), 'score'
+        and 'ambiguous', grouped by stem in sorted order and best score first
+        within each group
+    """
+    candidates = []
+    for normalized_name in sorted(matching_files):
+        sides = matching_files[normalized_name]
+        left_files, right_files = sides['L'], sides['R']
+        if not left_files or not right_files:
+            continue
+        ambiguous = len(left_files) > 1 or len(right_files) > 1
+        group = []
+        for left in left_files:
+            for right in right_files:
+                # Prefer files in the same folder, with the same tags and the same naming style
+                score = 0
+                if os.path.dirname(left['path']) == os.path.dirname(right['path']):
+                    score += 4
+                if left['tags'] == right['tags']:
+                    score += 2
+                if left['stem'] == right['stem']:
+                    score += 1
+                if (len(left['marker']) == 1) == (len(right['marker']) == 1):  # "L"/"R" or "left"/"right"
+                    score += 1
+                group.append({'left': left['path'], 'right': right['path'], 'group': normalized_name,
+                              'score': score, 'ambiguous': ambiguous})
+        group.sort(key=lambda candidate: (-candidate['score'], candidate['left'], candidate['right']))
+        candidates.extend(group)
+    return candidates
+
+def select_LR_pairs(candidates, include_ambiguous=True, one_per_ambiguous_group=True):
+    """
+    Pick non-overlapping pairs from ranked candidates: best score first, so
+    every file ends up in one pair at most and no two pairs are merged into
+    the same stereo file.
+
+    Args:
+        candidates: Candidates from rank_LR_candidates
+        include_ambiguous: Also pick pairs from ambiguous groups
+        one_per_ambiguous_group: Pick at most one pair of each ambiguous group
+
+    Returns:
+        list: Indices of the chosen candidates, in increasing order
+    """
+    ranked = sorted(range(len(candidates)), key=lambda index: (-candidates[index]['score'], index))
+    used_files = set()
+    used_outputs = set()
+    used_groups = set()
+    chosen = set()
+    for index in ranked:
+        candidate = candidates[index]
+        if candidate['ambiguous'] and not include_ambiguous:
+            continue
+        if candidate['left'] in used_files or candidate['right'] in used_files:
+            continue
+        if candidate['ambiguous'] and one_per_ambiguous_group and candidate['group'] in used_groups:
+            continue
+        output_file = os.path.normcase(get_stereo_output_path(candidate['left'], candidate['right']))
+        if output_file in used_outputs:
+            continue
+        used_files.update((candidate['left'], candidate['right']))
+        used_outputs.add(output_file)
+        used_groups.add(candidate['group'])
+        chosen.add(index)
+    return sorted(chosen)
+
+def validate_LR_pair(left_file, right_file):
+    """
+    Check whether two files can be merged into a stereo file, using only
+    their headers (no sample data is read).
+
+    Returns:
+        dict: 'status' (one of the LR_PAIR_* values), 'frame_difference'
+        (left frames minus right frames) and 'reason' (None when clean)
+    """
+    try:
+        left_info = get_audio_info(left_file)
+        right_info = get_audio_info(right_file)
+    except Exception as e:
+        return {'status': LR_PAIR_INCOMPATIBLE, 'frame_difference': 0, 'reason': f"unreadable header: {e}"}
+
+    frame_difference = left_info.frames - right_info.frames
+    reason = None
+    if left_info.samplerate != right_info.samplerate:
+        reason = f"sample rates differ ({left_info.samplerate} vs {right_info.samplerate})"
+    elif get_common_subtype(left_info.subtype, right_info.subtype) is None:
+        reason = f"formats differ ({left_info.subtype} vs {right_info.subtype})"
+    else:
+        for file, info in ((left_file, left_info), (right_file, right_info)):
+            # Only mono files and dualmono files (converted first) can be merged
+            if info.channels != 1 and not (info.channels == 2 and "(dualmono)" in file.lower()):
+                reason = f"{os.path.basename(file)} has {info.channels} channels"
+    if reason:
+        status = LR_PAIR_INCOMPATIBLE
+    elif frame_difference:
+        status = LR_PAIR_LENGTH_MISMATCH
+        reason = f"lengths differ by {abs(frame_difference)} frames"
+    elif left_info.channels != 1 or right_info.channels != 1:
+        status = LR_PAIR_NEEDS_MONO
+        reason = "dualmono side converted to mono first"
+    else:
+        status = LR_PAIR_CLEAN
+    return {'status': status, 'frame_difference': frame_difference, 'reason': reason}
+
+def validate_LR_candidates(candidates):
+    """
+    Validate ranked candidates (see validate_LR_pair) and drop the
+    incompatible ones. Each kept candidate gets a 'validation' entry, and
+    'ambiguous' is worked out again from the kept candidates only, so an
+    unmergeable file does not make its group ambiguous.
+
+    Returns:
+        list: The candidates that can be merged, in the same order
+    """
+    valid_candidates = []
+    for candidate in candidates:
+        candidate['validation'] = validate_LR_pair(candidate['left'], candidate['right'])
+        if candidate['validation']['status'] == LR_PAIR_INCOMPATIBLE:
+            print(f"Skipping L/R pair {os.path.basename(candidate['left'])} + {os.path.basename(candidate['right'])}: "
+                  f"{candidate['validation']['reason']}")
+        else:
+            valid_candidates.append(candidate)
+
+    group_files = {}  # {group: (left files, right files)}
+    for candidate in valid_candidates:
+        left_files, right_files = group_files.setdefault(candidate['group'], (set(), set()))
+        left_files.add(candidate['left'])
+        right_files.add(candidate['right'])
+    for candidate in valid_candidates:
+        left_files, right_files = group_files[candidate['group']]
+        candidate['ambiguous'] = len(left_files) > 1 or len(right_files) > 1
+    return valid_candidates
+
+def pair_LR_files(matching_files, include_ambiguous=False):
+    """
+    Pick the left/right pairs out of the groups found by find_matching_files.
+    Pairs that cannot be merged (see validate_LR_pair) are left out.
+
+    Returns:
+        list: (left file, right file) tuples
+    """
+    candidates = validate_LR_candidates(rank_LR_candidates(matching_files))
+    return [(candidates[i]['left'], candidates[i]['right']) for i in select_LR_pairs(candidates, include_ambiguous)]
+
+def show_LR_pairs(matching_files):
+    # Headers are checked before anything is shown: incompatible pairs are never offered
+    candidates = validate_LR_candidates(rank_LR_candidates(matching_files))
+    if not candidates:
         print("No matching L/R pairs found.")
         return []
 
-    root = tk.Tk()
-    root.title("L/R Pairs Found")
-    root.geometry("400x300")  # Slightly larger to accommodate buttons
-    
-    main_frame = tk.Frame(root)
-    main_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
-    
-    label = tk.Label(main_frame, text="Select files to join L/R pair to stereo:", font=('Arial', 10))
-    label.pack(pady=5)
-    
-    # Listbox frame
-    list_frame = tk.Frame(main_frame)
-    list_frame.pack(fill=tk.BOTH, expand=True)
-    
-    scrollbar = tk.Scrollbar(list_frame)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    
-    listbox = tk.Listbox(list_frame, 
-                        selectmode=tk.MULTIPLE,
-                        yscrollcommand=scrollbar.set,
-                        height=min(10, len(lr_pairs)),
-                        width=70,
-                        font=('Arial', 10))
-    scrollbar.config(command=listbox.yview)
-    
-    for left, right in lr_pairs:
-        left_name = os.path.basename(left)
-        right_name = os.path.basename(right)
-        display_text = f"{left_name[:30]}... | {right_name[:30]}..."
-        listbox.insert(tk.END, display_text)
-    
-    # Select all by default
-    listbox.selection_set(0, tk.END)
-    
-    listbox.pack(fill=tk.BOTH, expand=True)
-    
-    # Selection buttons frame (moved below listbox like in dualmono dialog)
-    btn_frame = tk.Frame(main_frame)
-    btn_frame.pack(pady=5)
-    
-    select_all_btn = tk.Button(btn_frame, text="Select All", 
-                             command=lambda: listbox.selection_set(0, tk.END))
-    select_all_btn.pack(side=tk.LEFT, padx=5)
-    
-    deselect_all_btn = tk.Button(btn_frame, text="Deselect All", 
-                               command=lambda: listbox.selection_clear(0, tk.END))
-    deselect_all_btn.pack(side=tk.LEFT, padx=5)
-    
-    selected_pairs = []
-    
-    def on_ok():
-        nonlocal selected_pairs
-        selected_indices = listbox.curselection()
-        selected_pairs = [lr_pairs[i] for i in selected_indices]
-        root.quit()
-    
-    ok_btn = tk.Button(main_frame, text="OK", command=on_ok)
-    ok_btn.pack(pady=10)
-    
-    # Center window
-    root.update_idletasks()
-    width = root.winfo_width()
-    height = root.winfo_height()
-    x = (root.winfo_screenwidth() // 2) - (width // 2)
-    y = (root.winfo_screenheight() // 2) - (height // 2)
-    root.geometry(f'+{x}+{y}')
-    
-    root.mainloop()
-    root.destroy()
-    return selected_pairs  # Only return selected pairs
+    labels = []
+    for candidate in candidates:
+        label = f"{os.path.basename(candidate['left'])[:30]}... | {os.path.basename(candidate['right'])[:30]}..."
+        if candidate['validation']['status'] == LR_PAIR_LENGTH_MISMATCH:
+            label += f" [{candidate['validation']['frame_difference']:+d} frames]"
+        elif candidate['validation']['status'] == LR_PAIR_NEEDS_MONO:
+            label += " [dualmono]"
+        if candidate['ambiguous']:
+            label += f" (ambiguous, score {candidate['score']})"
+        labels.append(label)
+    # Preselect the best non-overlapping pairs
+    selected_indices = ask_selection("L/R Pairs Found", "Select files to join L/R pair to stereo:", labels,
+                                     select_LR_pairs(candidates))
+    # A file can only be merged once, and into one stereo file: keep the best of overlapping selections
+    selected_candidates = [candidates[i] for i in selected_indices]
+    return [(selected_candidates[i]['left'], selected_candidates[i]['right'])
+            for i in select_LR_pairs(selected_candidates, one_per_ambiguous_group=False)]  # Only return selected pairs
 
-def convert_dualmono_to_mono(dualmono_files, convert):
-    if convert:
+def convert_dualmono_to_mono(dualmono_files, convert, workers=CONVERSION_WORKERS, progress_window=None):
+    """
+    Returns:
+        list: The mono file created for each dualmono file (None where it failed)
+    """
+    if not convert:
+        return []
+    if progress_window is None:
         progress_window = ProgressWindow("Converting dualmono to mono")
-        total_files = len(dualmono_files)
-        
-        for i, file_path in enumerate(dualmono_files):
-            progress_window.update(f"Processing: {os.path.basename(file_path)}", i, total_files)
-            
-            try:
-                # Read original file preserving exact format
-                file_info = sf.info(file_path)
-                original_data, original_sample_rate = sf.read(file_path, always_2d=True)
-                subtype = file_info.subtype
-
-                # Check channels and select the appropriate one
-                if original_data.shape[1] == 2:  # Check if file is stereo
-                    left_channel = original_data[:, 0]
-                    right_channel = original_data[:, 1]
-                    
-                    # Check if a channel is silent
-                    left_silent = np.all(np.abs(left_channel) < 1e-10)
-                    right_silent = np.all(np.abs(right_channel) < 1e-10)
-                    
-                    if left_silent or right_silent:
-                        # Show informative message
-                        silent_side = "left" if left_silent else "right"
-                        print(f"File {os.path.basename(file_path)} has silent {silent_side} channel. Converting to mono using active channel.")
-                        
-                        if left_silent and not right_silent:
-                            mono_data = right_channel  # Use right channel if left is silent
-                        elif right_silent and not left_silent:
-                            mono_data = left_channel  # Use left channel if right is silent
-                        else:
-                            mono_data = left_channel  # Default to left channel
-                    else:
-                        mono_data = left_channel  # Original behavior if both channels have audio
-                else:
-                    mono_data = original_data[:, 0] if original_data.ndim == 2 else original_data  # If mono, no change needed
+        try:
+            return progress_window.run_task(convert_dualmono_to_mono, dualmono_files, convert, workers, progress_window)
+        finally:
+            progress_window.close()
+    jobs = [(os.path.basename(file_path), convert_dualmono_file, (file_path,)) for file_path in dualmono_files]
+    return run_conversion_jobs(jobs, progress_window, workers)
+
+def convert_dualmono_file(file_path, progress_window=None):
+    """
+    Convert one dualmono file to mono and move the original to OBSOLETE FILES.
 
-                # Save mono file preserving original bit depth
-                output_file_path = file_path.replace('(dualmono).wav', '(mono).wav')
-                sf.write(output_file_path, mono_data, original_sample_rate, subtype=subtype)
+    Returns:
+        str: Path of the mono file, or None on error
+    """
+    try:
+        output_file_path = file_path.replace('(dualmono).wav', '(mono).wav')
+        prepared_file = _prepared_mono_files.pop(file_path, None)
+        if prepared_file and os.path.exists(prepared_file):
+            # Mono version already written while analysing: no need to read the file again
+            commit_output(prepared_file, output_file_path)
+        else:
+            # Stream the active channel to the mono file, block by block
+            convert_file_to_mono(file_path, output_file_path)
 
-                print(f"Mono file generated: {output_file_path}")
+        # Move original (dualmono) file to OBSOLETE FILES folder
+        move_to_obsolete(file_path)
 
-                # Move original (dualmono) file to OBSOLETE FILES folder
-                obsolete_folder_path = os.path.join(os.path.dirname(file_path), "-- OBSOLETE FILES")
-                os.makedirs(obsolete_folder_path, exist_ok=True)
-                shutil.move(file_path, os.path.join(obsolete_folder_path, os.path.basename(file_path)))
-                print(f"Dualmono file moved to OBSOLETE FILES folder: {file_path}")
+        # Log to the progress window when there is one, else print (never both:
+        # the headless ConsoleProgress prints its log lines itself)
+        if progress_window:
+            progress_window.add_log(f"Mono file generated: {os.path.basename(output_file_path)}")
+        else:
+            print(f"Mono file generated: {output_file_path}")
+            print(f"Dualmono file moved to OBSOLETE FILES folder: {file_path}")
+        return output_file_path
+
+    except Exception as e:
+        if progress_window:
+            progress_window.add_log(f"Error converting {os.path.basename(file_path)}: {e}")
+        else:
+            print("Error converting file:", e)
+        return None
+
+class JobLog:
+    """
+    Collects the log lines of a job running in a worker thread. It stands in
+    for the progress window (same add_log method) and its lines are shown in
+    the real window, from the thread running the jobs, when the job finishes.
+    """
+    def __init__(self):
+        self.lines = []
+
+    def add_log(self, message):
+        self.lines.append(message)
+
+def run_conversion_jobs(jobs, progress_window, workers=CONVERSION_WORKERS):
+    """
+    Run conversion jobs concurrently, at most `workers` at a time.
 
+    Each job function is called as function(*args, progress_window=JobLog()).
+    The progress window is only touched from the calling thread, as jobs finish.
+
+    Args:
+        jobs: List of (description, function, args) tuples
+        progress_window: ProgressWindow reporting per-job completion
+        workers: Maximum number of jobs running at the same time
+
+    Returns:
+        list: The result of each job, in the order of `jobs` (None if it failed)
+    """
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {}
+        for index, (description, function, args) in enumerate(jobs):
+            job_log = JobLog()
+            futures[executor.submit(function, *args, progress_window=job_log)] = (index, job_log)
+
+        for completed_jobs, future in enumerate(as_completed(futures), start=1):
+            index, job_log = futures[future]
+            description = jobs[index][0]
+            try:
+                results[index] = future.result()
             except Exception as e:
-                print("Error converting file:", e)
-                
-        progress_window.root.destroy()
+                job_log.add_log(f"Error processing {description}: {e}")
+            for line in job_log.lines:
+                progress_window.add_log(line)
+            progress_window.update(f"Finished: {description}", completed_jobs, len(jobs))
+    sync_written_files()  # One flush per folder for the whole batch
+    return results
+
+def convert_file_to_mono(file_path, output_file_path):
+    """
+    Write the mono version of an audio file block by block, preserving its
+    samplerate and subtype. Memory use does not depend on the file length.
+
+    Stereo files keep the left channel unless it is silent, in which case
+    the right channel is kept; the choice is made in the same single pass
+    (see MonoCapture), so the file is never loaded twice.
+
+    Args:
+        file_path: Source audio file
+        output_file_path: Mono file to create
+    """
+    started = time.perf_counter()
+    with sf.SoundFile(file_path) as source:
+        dtype = get_native_dtype(source.subtype)
+        block_buffer = np.empty((ANALYSIS_BLOCK_FRAMES, source.channels), dtype=dtype)
+
+        if source.channels != 2:
+            # Mono (or multichannel) source: copy the first channel
+            with atomic_output(output_file_path) as temp_path, \
+                    sf.SoundFile(temp_path, 'w', source.samplerate, 1, source.subtype, format='WAV') as output:
+                for block in source.blocks(out=block_buffer):
+                    output.write(block[:, 0])
+            profile_operation('convert_file_to_mono', started, read_files=[file_path], written_files=[output_file_path])
+            return
+
+        classifier = ChannelClassifier(get_tolerance(dtype))
+        capture = MonoCapture(output_file_path, source.samplerate, source.subtype, keep_left=True)
+        try:
+            for block in source.blocks(out=block_buffer):
+                classifier.feed(block[:, 0], block[:, 1])
+                capture.write(block[:, 0], block[:, 1], classifier)
+            captured_path = capture.finish(classifier)
+        except Exception:
+            capture.discard()
+            raise
+
+    if classifier.left_silent or classifier.right_silent:
+        silent_side = "left" if classifier.left_silent else "right"
+        print(f"File {os.path.basename(file_path)} has silent {silent_side} channel. Converting to mono using active channel.")
+    commit_output(captured_path, output_file_path)
+    profile_operation('convert_file_to_mono', started, read_files=[file_path], written_files=[output_file_path])
 
 def confirm_convert_dualmono_to_mono(dualmono_files):
     if not dualmono_files:
@@ -421,11 +1753,13 @@ def confirm_convert_dualmono_to_mono(dualmono_files):
     print(f"Selected files: {selected_files}")  # Debug log
     
     if not selected_files:  # If no files were selected
+        discard_prepared_mono_files()
         print("Continuing with L/R files detection...")
         return True  # Continue with the flow
     
     # If there are selected files, convert them directly
     convert_dualmono_to_mono(selected_files, True)
+    discard_prepared_mono_files()  # Mono versions of files left as dualmono
     
     # Always continue with the flow after processing dualmono
     return True
@@ -462,30 +1796,62 @@ def confirm_delete_hidden_files(folder):
             delete_hidden_files(folder)
 
 def delete_hidden_files(folder):
-    for root_dir, dirs, files in os.walk(folder):
+    deleted_files = []
+    for root_dir, files in get_snapshot(folder).walk():
         for file in files:
-            if file.startswith("."):
+            if is_hidden_file(file):
                 file_path = os.path.join(root_dir, file)
-                os.remove(file_path)
+                started = time.perf_counter()
+                with journaled('delete', source=file_path):
+                    os.remove(file_path)
+                record_file_change(old_path=file_path)
+                profile_operation('delete_hidden_file', started, [file_path])
+                deleted_files.append(file_path)
                 print(f"File deleted: {file_path}")
+    return deleted_files
 
 def confirm_identify_audio_type(folder):
-    if not contains_labeled_files(folder):
-        identify = messagebox.askyesno("Confirm", "Do you want to identify the audio type (mono/stereo) of the files?\n\nThis will only label files, not convert them.")
+    unlabeled_files = find_unlabeled_files(folder)
+    if unlabeled_files:
+        if contains_labeled_files(folder):
+            # A processed session with new files added since
+            question = f"Do you want to identify the audio type (mono/stereo) of the {len(unlabeled_files)} unlabeled files?"
+        else:
+            question = "Do you want to identify the audio type (mono/stereo) of the files?"
+        identify = messagebox.askyesno("Confirm", question + "\n\nThis will only label files, not convert them.")
         if identify:
             return identify_audio_type(folder)  # Returns found dualmono files
     return []
 
+def find_unlabeled_files(folder):
+    """
+    List the WAV files identification would analyse: not labeled yet, not
+    hidden/temporary and not in an OBSOLETE FILES folder.
+
+    Returns:
+        list: Their paths, in walk order
+    """
+    file_paths = []
+    for root_dir, files in get_snapshot(folder).walk():
+        if os.path.basename(root_dir) == OBSOLETE_FOLDER_NAME:  # Processed originals
+            continue
+        for file in files:
+            if file.endswith(".wav") and not is_hidden_file(file) and not is_labeled_file(file):
+                file_paths.append(os.path.join(root_dir, file))
+    return file_paths
+
 def contains_labeled_files(folder):
-    for root_dir, _, files in os.walk(folder):
+    for root_dir, files in get_snapshot(folder).walk():
         for file in files:
-            if "(mono)" in file or "(stereo)" in file:
+            if is_hidden_file(file):
+                continue  # e.g. ".Kick (mono).aps-left-....wav", left by an interrupted run
+            if is_labeled_file(file):
                 return True
     return False
 
 class ProgressWindow:
-    def __init__(self, title="Progress"):
-        self.root = tk.Toplevel()
+    def __init__(self, title="Progress", log_file=PROGRESS_LOG_FILE):
+        self.root = tk.Toplevel(get_tk_root())
         self.root.withdraw()  # Hide window initially
         self.root.title(title)
         
@@ -534,22 +1900,138 @@ class ProgressWindow:
         self.yes_button = tk.Button(self.button_frame, text="Yes", command=self.set_response_yes)
         self.no_button = tk.Button(self.button_frame, text="No", command=self.set_response_no)
         self.user_response = None
+
+        # Last lines of the activity log (what log_text shows) and, optionally,
+        # a file that keeps all of them
+        self.log_lines = deque(maxlen=PROGRESS_LOG_MAX_LINES)
+        self.log_file = None
+        if log_file:
+            try:
+                self.log_file = open(log_file, 'a', encoding='utf-8')
+                self.log_file.write(f"--- {title} ---\n")
+            except Exception as e:
+                print(f"Could not open log file {log_file}: {e}")
+
+        # Progress events posted by the worker thread, applied by refresh()
+        self.events = queue.Queue()
+        self.task_done = tk.BooleanVar(master=self.root, value=False)
+        self.root.protocol("WM_DELETE_WINDOW", lambda: None)  # Closed by the task, not the user
+        self.refresh_job = self.root.after(PROGRESS_REFRESH_MS, self.refresh)
         
     def update(self, status, value, max_value):
-        self.status_label.config(text=status)
-        self.progress["maximum"] = max_value
-        self.progress["value"] = value
+        # Safe to call from any thread: the widgets are updated by refresh()
         percent = int((value / max_value) * 100) if max_value > 0 else 0
-        self.percent_label.config(text=f"{percent}%")
-        
-        self.log_text.insert(tk.END, f"{status} ({percent}%)\n")
-        self.log_text.see(tk.END)
-        self.root.update()
+        self.events.put(('status', status, value, max_value, percent))
+        self.events.put(('log', f"{status} ({percent}%)"))
         
     def add_log(self, message):
-        self.log_text.insert(tk.END, f"{message}\n")
+        self.events.put(('log', message))
+
+    def refresh(self):
+        """
+        Apply the queued progress events to the widgets. Runs on the Tk thread
+        every PROGRESS_REFRESH_MS, so the cost of a repaint does not depend on
+        how many events were posted in between.
+        """
+        status = None
+        lines = []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            kind = event[0]
+            if kind == 'status':
+                status = event[1:]  # Only the latest status is shown
+            elif kind == 'log':
+                lines.append(event[1])
+            elif kind == 'call':
+                self.write_log(lines)
+                lines = []
+                _, function, args, reply = event
+                try:
+                    reply['result'] = function(*args)
+                except Exception as e:
+                    reply['error'] = e
+                reply['done'].set()
+            elif kind == 'done':
+                self.task_done.set(True)
+
+        started = time.perf_counter()
+        if status:
+            text, value, max_value, percent = status
+            self.status_label.config(text=text)
+            self.progress["maximum"] = max_value
+            self.progress["value"] = value
+            self.percent_label.config(text=f"{percent}%")
+        self.write_log(lines)
+        if status or lines:
+            profile_operation('progress_repaint', started)
+        self.refresh_job = self.root.after(PROGRESS_REFRESH_MS, self.refresh)
+
+    def write_log(self, lines):
+        """
+        Append a batch of lines to the activity log, keeping at most
+        PROGRESS_LOG_MAX_LINES in the widget.
+        """
+        if not lines:
+            return
+        lines = "\n".join(lines).split("\n")  # A message may span several lines
+        if self.log_file:
+            self.log_file.write("\n".join(lines) + "\n")
+            self.log_file.flush()
+
+        shown_lines = len(self.log_lines)
+        self.log_lines.extend(lines)
+        if len(lines) >= self.log_lines.maxlen:
+            # The batch alone fills the log: replace the whole text
+            self.log_text.delete("1.0", tk.END)
+            self.log_text.insert(tk.END, "\n".join(self.log_lines) + "\n")
+        else:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            dropped_lines = shown_lines + len(lines) - len(self.log_lines)
+            if dropped_lines > 0:
+                self.log_text.delete("1.0", f"{dropped_lines + 1}.0")
         self.log_text.see(tk.END)
-        self.root.update()
+
+    def run_task(self, function, *args):
+        """
+        Run function(*args) in a worker thread while the window keeps
+        refreshing, and wait for it to finish.
+
+        Returns:
+            The function's return value (its exception is re-raised)
+        """
+        outcome = {}
+
+        def worker():
+            try:
+                outcome['result'] = function(*args)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                self.events.put(('done',))
+
+        self.task_done.set(False)
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.wait_variable(self.task_done)  # Keeps the Tk event loop running
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('result')
+
+    def call_in_ui(self, function, *args):
+        """
+        Run function(*args) on the Tk thread (e.g. to show a dialog from the
+        worker thread) and wait for its result.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return function(*args)
+        reply = {'done': threading.Event()}
+        self.events.put(('call', function, args, reply))
+        reply['done'].wait()
+        if 'error' in reply:
+            raise reply['error']
+        return reply.get('result')
         
     def ask_question(self, question):
         self.log_text.insert(tk.END, f"\n{question}\n")
@@ -567,134 +2049,690 @@ class ProgressWindow:
         self.user_response.set(False)
         
     def show_files_list(self, files, title="Files found"):
-        self.log_text.insert(tk.END, f"\n{title}:\n")
+        self.add_log(f"\n{title}:")
         for file in files:
-            self.log_text.insert(tk.END, f"- {os.path.basename(file)}\n")
-        self.log_text.see(tk.END)
-        self.root.update()
+            self.add_log(f"- {os.path.basename(file)}")
+
+    def close(self):
+        self.root.after_cancel(self.refresh_job)
+        if self.log_file:
+            self.log_file.close()
+        self.root.destroy()
+
+class ConsoleProgress:
+    """
+    Text-only replacement for ProgressWindow used by the headless mode.
+    Messages are printed instead of shown in a window.
+    """
+    def update(self, status, value, max_value):
+        percent = int((value / max_value) * 100) if max_value > 0 else 0
+        print(f"{status} ({percent}%)")
+
+    def add_log(self, message):
+        print(message)
+
+    def show_files_list(self, files, title="Files found"):
+        print(f"{title}:")
+        for file in files:
+            print(f"- {os.path.basename(file)}")
+
+    def run_task(self, function, *args):
+        return function(*args)
 
-def identify_audio_type(folder):
-    progress_window = ProgressWindow("Analyzing audio files")
+    def call_in_ui(self, function, *args):
+        return function(*args)
+
+    def close(self):
+        pass
+
+def identify_audio_type(folder, workers=ANALYSIS_WORKERS, progress_window=None, interactive=True, labeled_files=None):
+    """
+    Label every unlabeled WAV in the folder as mono/stereo/dualmono and
+    convert the files with a silent channel to mono.
+
+    Args:
+        folder: Project folder
+        workers: Analysis worker processes (see analyze_audio_files)
+        progress_window: Progress reporter (a new ProgressWindow by default)
+        interactive: Show the files with a silent channel in one dialog at
+            the end of the scan (they are always listed in the log)
+        labeled_files: Optional list that receives a dict with 'path',
+            'audio_type' and 'new_path' for every file analysed
+
+    Returns:
+        list: The dualmono files found (after renaming)
+    """
+    if progress_window is None:
+        # Run in a worker thread so the window stays responsive
+        progress_window = ProgressWindow("Analyzing audio files")
+        try:
+            return progress_window.run_task(identify_audio_type, folder, workers, progress_window,
+                                            interactive, labeled_files)
+        finally:
+            progress_window.close()
     dualmono_files = []
-    total_files = sum([len(files) for _, _, files in os.walk(folder) if any(f.endswith('.wav') for f in files)])
-    processed_files = 0
-    
-    # Walk through all directories
-    for root_dir, _, files in os.walk(folder):
-        wav_files = [file for file in files if file.endswith(".wav")]
-        
-        # Process each WAV file
-        for file in wav_files:
-            # Skip already labeled files
-            if "(mono)" in file or "(stereo)" in file:
-                continue
-                
-            original_path = os.path.join(root_dir, file)
-            audio_type = get_audio_type(original_path)
-            
-            if not audio_type:
-                continue
-                
+
+    # Collect the files to analyse in a deterministic order (new files of a labeled project included)
+    file_paths = find_unlabeled_files(folder)
+    total_files = len(file_paths)
+
+    # Reuse cached results of unchanged files; only new or changed files are decoded
+    cache = AnalysisCache(folder)
+    results = {}
+    pending_paths = []
+    for file_path in file_paths:
+        cached_result = cache.lookup(file_path)
+        if cached_result:
+            results[file_path] = cached_result
+            remember_audio_info(file_path, cached_result['info'])
+        else:
+            pending_paths.append(file_path)
+    silent_channel_files = []  # (path, silent side), reported once at the end
+    if results:
+        progress_window.add_log(f"{len(results)} unchanged files taken from the analysis cache")
+
+    # Analyse in parallel; results arrive in completion order
+    last_cache_save = time.time()
+    for result in analyze_audio_files(pending_paths, workers, CAPTURE_MONO_DURING_ANALYSIS):
+        results[result['path']] = result
+        remember_audio_info(result['path'], result['info'])
+        cache.store(result)
+        count_analysis(result)
+        if time.time() - last_cache_save >= ANALYSIS_CACHE_SAVE_SECONDS:
+            cache.save()  # An interrupted scan resumes from here
+            last_cache_save = time.time()
+        progress_window.update(f"Analyzed: {os.path.basename(result['path'])}", len(results), total_files)
+
+    # Apply renames and conversions afterwards, in walk order
+    for processed_files, original_path in enumerate(file_paths, start=1):
+        root_dir, file = os.path.split(original_path)
+        result = results[original_path]
+        audio_type = result['audio_type']
+        mono_capture = result['mono_capture']
+        new_path = None
+
+        if audio_type:
             try:
                 # Handle silent channel conversion
                 if audio_type == "silent_channel":
-                    file_info = sf.info(original_path)
                     new_name = f"{os.path.splitext(file)[0]} (mono).wav"
-                    data, sample_rate = sf.read(original_path)
-                    
-                    # Select active channel
-                    left_channel = data[:, 0]
-                    right_channel = data[:, 1]
-                    mono_data = right_channel if np.all(np.abs(left_channel) < 1e-10) else left_channel
-                    
-                    # Save preserving original bit depth
-                    sf.write(os.path.join(root_dir, new_name), mono_data, sample_rate, subtype=file_info.subtype)
-                    print(f"File with silent channel converted to mono (preserving {file_info.subtype}): {original_path} -> {new_name}")
+                    if mono_capture:
+                        # Mono version already written while analysing: no second read
+                        commit_output(mono_capture, os.path.join(root_dir, new_name))
+                        mono_capture = None
+                        print(f"File with silent channel converted to mono: {original_path} -> {new_name}")
+                    else:
+                        # Stream the active channel, preserving original bit depth
+                        convert_file_to_mono(original_path, os.path.join(root_dir, new_name))
+                        print(f"File with silent channel converted to mono (preserving {get_audio_info(original_path).subtype}): {original_path} -> {new_name}")
                     
                     # Move original to obsolete folder
-                    obsolete_path = os.path.join(root_dir, "-- OBSOLETE FILES")
-                    os.makedirs(obsolete_path, exist_ok=True)
-                    shutil.move(original_path, os.path.join(obsolete_path, file))
+                    cache.rename(original_path, move_to_obsolete(original_path))
+                    new_path = os.path.join(root_dir, new_name)
+                    silent_channel_files.append((original_path, result['silent_side']))
                 
                 # Rename other audio types
                 else:
                     new_name = f"{os.path.splitext(file)[0]} ({audio_type}).wav"
-                    os.rename(original_path, os.path.join(root_dir, new_name))
+                    rename_file(original_path, os.path.join(root_dir, new_name))
+                    cache.rename(original_path, os.path.join(root_dir, new_name))
+                    new_path = os.path.join(root_dir, new_name)
                     if audio_type == "dualmono":
                         dualmono_files.append(os.path.join(root_dir, new_name))
+                        if mono_capture:
+                            # Kept for the dualmono conversion step
+                            _prepared_mono_files[os.path.join(root_dir, new_name)] = mono_capture
+                            mono_capture = None
             
             except Exception as e:
                 print(f"Error processing file {file}: {e}")
+
+        # Captured mono version that was not used
+        if mono_capture and os.path.exists(mono_capture):
+            os.remove(mono_capture)
+        if labeled_files is not None:
+            labeled_files.append({'path': original_path, 'audio_type': audio_type, 'new_path': new_path})
             
-            # Update progress
-            processed_files += 1
-            progress_window.update(f"Processing: {file}", processed_files, total_files)
+        # Update progress
+        progress_window.update(f"Processing: {file}", processed_files, total_files)
     
-    progress_window.root.destroy()
+    cache.save()
+    sync_written_files()
+
+    if silent_channel_files:
+        progress_window.show_files_list(
+            [f"{file} (silent {silent_side} channel)" for file, silent_side in silent_channel_files],
+            "Files with a silent channel, converted to mono")
+        if interactive:
+            progress_window.call_in_ui(show_silent_channel_report, silent_channel_files)
     
     # Return dualmono files found (let main flow handle conversion)
     return dualmono_files
 
-def get_audio_type(file):
+def analyze_audio_files(file_paths, workers=ANALYSIS_WORKERS, capture_mono=False):
+    """
+    Analyse audio files in a pool of worker processes.
+
+    Args:
+        file_paths: Paths of the files to analyse
+        workers: Number of worker processes (None = one per CPU core, 1 = run in this process)
+        capture_mono: Passed on to analyze_audio_file
+
+    Yields:
+        dict: The result of analyze_audio_file for each file, as soon as it finishes
+    """
+    if workers == 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            yield analyze_audio_file(file_path, capture_mono)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context(ANALYSIS_START_METHOD)) as executor:
+        futures = {executor.submit(analyze_audio_file, file_path, capture_mono): file_path for file_path in file_paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker died (e.g. the pool broke): report the file as unreadable
+                print(f"Error analysing file {futures[future]}: {e}")
+                yield {'path': futures[future], 'audio_type': None, 'silent_side': None, 'info': None, 'fingerprint': None, 'mono_capture': None}
+
+def analyze_audio_file(file, capture_mono=False):
+    """
+    Analyse one audio file without any user interaction (safe in worker processes).
+
+    Args:
+        file: Path to the audio file
+        capture_mono: Also write the mono version of dualmono/silent-channel
+            files during the same read (see MonoCapture)
+
+    Returns:
+        dict: 'path', 'audio_type' ("mono", "stereo", "dualmono", "silent_channel",
+        "unknown" or None on error), 'silent_side' ("left"/"right" for
+        silent_channel files, else None), 'info' (channels, samplerate, frames,
+        subtype), 'fingerprint' (see get_fingerprint, stereo files only),
+        'mono_capture' (temporary path of the captured mono version, or None),
+        'seconds' (time the analysis took) and 'bytes_read' (bytes read
+        from the file: header, fingerprint and the sample blocks classified), the last two for the run profile
+    """
+    started = time.perf_counter()
+    result = {'path': file, 'audio_type': None, 'silent_side': None, 'info': None, 'fingerprint': None,
+              'mono_capture': None, 'bytes_read': 0}
+    capture = None
     try:
-        # Read file preserving original format
-        file_info = sf.info(file)
-        data, sample_rate = sf.read(file)
-        subtype = file_info.subtype
-
-        if len(data.shape) == 1 or data.shape[1] == 1:
-            return "mono"
-        elif data.shape[1] == 2:
-            left_channel = data[:, 0]
-            right_channel = data[:, 1]
-            
-            # Improved silent channel detection
-            left_silent = np.all(np.abs(left_channel) < 1e-10)
-            right_silent = np.all(np.abs(right_channel) < 1e-10)
-            
-            if left_silent or right_silent:
-                silent_side = "left" if left_silent else "right"
-                root = tk.Tk()
-                root.withdraw()
-                root.after(100, lambda: root.focus_force())
-                messagebox.showinfo("Silent Channel Detected", 
-                    f"File {os.path.basename(file)} has silent {silent_side} channel.\n"
-                    "It will be automatically converted to mono.")
-                root.destroy()
-                return "silent_channel"  # New type for files with silent channels
-            
-            channel_type = detect_audio_type(data)
-            if channel_type == "False stereo":
-                return "dualmono"
-            else:
-                return "stereo"
+        # Mono and multichannel files are decided from the header alone
+        file_info = get_audio_info(file)
+        result['info'] = file_info._asdict()
+
+        if file_info.channels == 1:
+            result['audio_type'] = "mono"
+        elif file_info.channels != 2:
+            result['audio_type'] = "unknown"
         else:
-            return "unknown"
+            result['fingerprint'] = get_fingerprint(file)
+            # Plain PCM WAV/RF64 is classified straight from the mapped data chunk;
+            # anything else goes through libsndfile
+            if capture_mono:
+                capture = MonoCapture(f"{os.path.splitext(file)[0]} (mono).wav", file_info.samplerate, file_info.subtype)
+            layout = read_wav_layout(file)
+            classifier = classify_pcm_memmap(file, layout, capture) if layout else None
+            if classifier is None:
+                classifier = classify_soundfile(file, capture)
+            result['audio_type'] = classifier.verdict()
+            if result['audio_type'] == "silent_channel":
+                result['silent_side'] = "left" if classifier.left_silent else "right"
+            if capture:
+                result['mono_capture'] = capture.finish(classifier)
+
+            # Reading stops at the first block that proves true stereo
+            file_size = os.path.getsize(file)
+            if layout:
+                header_bytes, frame_bytes = layout['data_offset'], layout['block_align']
+            else:
+                header_bytes, frame_bytes = 0, file_size / max(file_info.frames, 1)  # Approximate for decoded formats
+            result['bytes_read'] = int(header_bytes + classifier.frames * frame_bytes + min(file_size, 2 * FINGERPRINT_BYTES))
     except Exception as e:
         print("Error obtaining file information:", e)
+        if capture:
+            capture.discard()
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def get_fingerprint(file):
+    """
+    Cheap content fingerprint of a file: a hash of its size and of its first
+    and last FINGERPRINT_BYTES bytes (headers and sample data differ there).
+    """
+    size = os.path.getsize(file)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(file, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """
+    Per-project index of analysis results stored next to the project files.
+
+    Entries are keyed by the path relative to the project root and are only
+    reused while the file keeps the same size and mtime. A content fingerprint
+    lets a stereo file's entry follow it when it is renamed or moved outside
+    APS (mono and multichannel verdicts come from the header alone and have
+    none), and the index is bounded to ANALYSIS_CACHE_MAX_ENTRIES (least
+    recently seen are evicted).
+    """
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, ANALYSIS_CACHE_FILE)
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == ANALYSIS_CACHE_VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.entries = {}  # Missing or unreadable cache: start empty
+
+    def key(self, file_path):
+        return os.path.relpath(file_path, self.folder).replace(os.sep, '/')
+
+    def key_exists(self, key):
+        return file_exists(os.path.join(self.folder, *key.split('/')))
+
+    def lookup(self, file_path):
+        """
+        Get the cached result for a file if it has not changed.
+
+        Returns:
+            dict: A result like analyze_audio_file's, or None on a cache miss
+        """
+        stat = get_file_stat(file_path)
+        if stat is None:
+            return None
+        key = self.key(file_path)
+        entry = self.entries.get(key)
+
+        if not entry or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            # Not indexed under this name: look for an entry whose file is gone
+            # (renamed or moved) with the same size and content fingerprint
+            orphans = [old_key for old_key, old_entry in self.entries.items()
+                       if old_entry['size'] == stat.st_size and old_entry['fingerprint']
+                       and not self.key_exists(old_key)]
+            if not orphans:
+                return None
+            fingerprint = get_fingerprint(file_path)
+            old_key = next((old_key for old_key in orphans if self.entries[old_key]['fingerprint'] == fingerprint), None)
+            if old_key is None:
+                return None
+            entry = self.entries.pop(old_key)
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self.entries[key] = entry
+
+        entry['last_seen'] = time.time()
+        return {
+            'path': file_path,
+            'audio_type': entry['audio_type'],
+            'silent_side': entry['silent_side'],
+            'info': entry['info'],
+            'fingerprint': entry['fingerprint'],
+            'mono_capture': None,
+        }
+
+    def store(self, result):
+        if not result['audio_type']:
+            return  # Never cache failed analyses (header-only verdicts are kept, without a fingerprint)
+        stat = get_file_stat(result['path'])
+        if stat is None:
+            return
+        self.entries[self.key(result['path'])] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'fingerprint': result['fingerprint'],
+            'audio_type': result['audio_type'],
+            'silent_side': result['silent_side'],
+            'info': result['info'],
+            'last_seen': time.time(),
+        }
+
+    def rename(self, old_path, new_path):
+        """Keep an entry valid when APS renames or moves its file."""
+        entry = self.entries.pop(self.key(old_path), None)
+        if entry:
+            self.entries[self.key(new_path)] = entry
+
+    def save(self):
+        # Evict entries whose file no longer exists, then the least recently seen
+        self.entries = {key: entry for key, entry in self.entries.items() if self.key_exists(key)}
+        if len(self.entries) > ANALYSIS_CACHE_MAX_ENTRIES:
+            newest = sorted(self.entries.items(), key=lambda item: item[1]['last_seen'], reverse=True)
+            self.entries = dict(newest[:ANALYSIS_CACHE_MAX_ENTRIES])
+
+        try:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': ANALYSIS_CACHE_VERSION, 'entries': self.entries}, f)
+            os.replace(temp_path, self.path)
+            record_file_change(new_path=self.path)
+        except OSError as e:
+            print(f"Error saving analysis cache: {e}")
+
+def count_analysis(result):
+    """
+    Count a file analysed (possibly in a worker process) for the run profile,
+    with the bytes it actually read (see analyze_audio_file): stereo files
+    only up to the first block that proves them true stereo, mono and
+    multichannel files only their header (not counted).
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return
+    profiler.count('analyze_audio_file', result.get('seconds', 0), [result['path']],
+                   result.get('bytes_read', 0),
+                   get_file_size(result['mono_capture']) if result['mono_capture'] else 0)
+
+def get_audio_type(file):
+    result = analyze_audio_file(file)
+    count_analysis(result)
+    if result['audio_type'] == "silent_channel":
+        print(f"File {os.path.basename(file)} has silent {result['silent_side']} channel.")
+    return result['audio_type']
+
+# Files named in the silent channel summary dialog (the rest are counted)
+SILENT_REPORT_MAX_FILES = 20
+
+def show_silent_channel_report(silent_channel_files):
+    """
+    Show one dialog listing all the files of a scan that had a silent channel.
+
+    Args:
+        silent_channel_files: List of (file path, silent side) tuples
+    """
+    lines = [f"- {os.path.basename(file)} (silent {silent_side})"
+             for file, silent_side in silent_channel_files[:SILENT_REPORT_MAX_FILES]]
+    if len(silent_channel_files) > SILENT_REPORT_MAX_FILES:
+        lines.append(f"... and {len(silent_channel_files) - SILENT_REPORT_MAX_FILES} more (see the activity log)")
+    messagebox.showinfo("Silent Channel Detected",
+        f"{len(silent_channel_files)} files had a silent channel and were converted to mono "
+        "using the active channel:\n\n" + "\n".join(lines), parent=get_tk_root())
+
+def classify_soundfile(file, capture=None):
+    """
+    Classify a stereo file by decoding it with libsndfile block by block.
+
+    Args:
+        file: Path to the stereo file
+        capture: Optional MonoCapture fed with every block read
+
+    Returns:
+        ChannelClassifier: the final channel state
+    """
+    # Stream the file block by block instead of decoding it all at once
+    with sf.SoundFile(file) as audio_file:
+        # Read in the native sample width so PCM is compared bit-exactly
+        dtype = get_native_dtype(audio_file.subtype)
+        classifier = ChannelClassifier(get_tolerance(dtype))
+        block_buffer = np.empty((ANALYSIS_BLOCK_FRAMES, 2), dtype=dtype)
+        for block in audio_file.blocks(out=block_buffer):
+            true_stereo = classifier.feed(block[:, 0], block[:, 1])
+            if capture:
+                capture.write(block[:, 0], block[:, 1], classifier)
+            # Stop as soon as the channels are known to differ (true stereo)
+            if true_stereo:
+                break
+    return classifier
+
+def classify_pcm_memmap(file, layout, capture=None):
+    """
+    Classify a stereo PCM WAV directly from its memory-mapped data chunk.
+
+    The left and right channels are strided views into the mapping, so no
+    sample is decoded or copied and the file is read sequentially. Blocks
+    are only unpacked when a capture needs them.
+
+    Returns:
+        ChannelClassifier: the final channel state, or None if the file
+        cannot be mapped (the caller should fall back to soundfile)
+    """
+    samples = map_pcm_samples(file, layout)
+    if samples is None:
         return None
 
-def detect_audio_type(data):
+    _, silence_value = PCM_SAMPLE_LAYOUTS[(layout['format'], layout['bits'])]
+    tolerance = FLOAT_TOLERANCE if layout['format'] == WAVE_FORMAT_IEEE_FLOAT else 0
+    classifier = ChannelClassifier(tolerance, silence_value)
+    left_channel = samples['ch0']
+    right_channel = samples['ch1']
+    for start in range(0, layout['frames'], ANALYSIS_BLOCK_FRAMES):
+        end = start + ANALYSIS_BLOCK_FRAMES
+        true_stereo = classifier.feed(left_channel[start:end], right_channel[start:end])
+        if capture:
+            capture.write(left_channel[start:end], right_channel[start:end], classifier,
+                          unpack=lambda block: unpack_pcm_samples(block, layout))
+        if true_stereo:
+            break
+
+    # Drop the views so the mapping is closed and the file can be renamed (Windows)
+    del left_channel, right_channel, samples
+    return classifier
+
+def read_wav_layout(file):
+    """
+    Parse the RIFF chunks of a WAV/RF64 file to locate its sample data.
+
+    Returns:
+        dict: format, channels, samplerate, bits, block_align, data_offset
+        and frames, or None if the file is not a PCM/float WAV this engine
+        can map
+    """
     try:
-        if data.shape[1] == 2:
-            left_channel = data[:, 0]
-            right_channel = data[:, 1]
+        file_size = os.path.getsize(file)
+        with open(file, 'rb') as f:
+            header = f.read(12)
+            if len(header) < 12 or header[8:12] != b'WAVE' or header[:4] not in (b'RIFF', b'RF64', b'BW64'):
+                return None
 
-            # Check if a channel is empty (silent)
-            left_empty = np.all(np.abs(left_channel) < 1e-10)
-            right_empty = np.all(np.abs(right_channel) < 1e-10)
+            layout = None
+            data_offset = None
+            data_size = None
+            ds64_data_size = None
+            position = 12
+            while position + 8 <= file_size:
+                f.seek(position)
+                chunk_id, chunk_size = struct.unpack('<4sI', f.read(8))
+                body = position + 8
 
-            if left_empty or right_empty:
-                return "False stereo"
-            
-            # Check if both channels are equal
-            absolute_difference = np.abs(left_channel - right_channel)
-            tolerance = 1e-10
+                if chunk_id == b'ds64':
+                    ds64_data_size = struct.unpack('<QQ', f.read(16))[1]
+                elif chunk_id == b'fmt ':
+                    fmt = f.read(min(chunk_size, 40))
+                    format_code, channels, samplerate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+                    if format_code == WAVE_FORMAT_EXTENSIBLE:
+                        if len(fmt) < 40 or fmt[26:40] != EXTENSIBLE_GUID_TAIL:
+                            return None
+                        format_code = struct.unpack('<H', fmt[24:26])[0]
+                    layout = {
+                        'format': format_code,
+                        'channels': channels,
+                        'samplerate': samplerate,
+                        'bits': bits,
+                        'block_align': block_align,
+                    }
+                elif chunk_id == b'data':
+                    data_offset = body
+                    data_size = chunk_size
+                    if chunk_size == 0xFFFFFFFF and ds64_data_size is not None:
+                        data_size = ds64_data_size
 
-            if np.all(absolute_difference < tolerance):
-                return "False stereo"
-            else:
+                if data_offset is not None and layout:
+                    break
+                # Chunks are padded to an even number of bytes
+                position = body + chunk_size + (chunk_size & 1)
+    except (OSError, struct.error):
+        return None
+
+    if not layout or data_offset is None:
+        return None
+    if (layout['format'], layout['bits']) not in PCM_SAMPLE_LAYOUTS:
+        return None
+    if layout['channels'] < 1 or layout['block_align'] < layout['channels'] * layout['bits'] // 8:
+        return None
+
+    # A truncated file only maps the frames actually on disk
+    data_size = min(data_size, file_size - data_offset)
+    layout['data_offset'] = data_offset
+    layout['frames'] = data_size // layout['block_align']
+    return layout
+
+def unpack_pcm_samples(samples, layout):
+    """
+    Convert a block of raw mapped samples to an array soundfile can write
+    without changing a single sample value.
+    """
+    if layout['format'] == WAVE_FORMAT_PCM and layout['bits'] == 24:
+        # Packed little-endian bytes -> left-aligned int32 (how libsndfile scales 24-bit)
+        packed = samples.astype(np.int32)
+        return (packed[:, 0] << 8) | (packed[:, 1] << 16) | (packed[:, 2] << 24)
+    if layout['format'] == WAVE_FORMAT_PCM and layout['bits'] == 8:
+        # Unsigned 8-bit -> left-aligned int16
+        return (samples.astype(np.int16) - 128) << 8
+    return samples
+
+class MonoCapture:
+    """
+    Writes the mono version of a stereo file while it is being analysed.
+
+    While the file may still turn out dualmono or silent-channel, the
+    channel that would be kept is streamed to a hidden temporary file, so
+    the later conversion does not need to read the file again. Two
+    candidates are tracked: the left channel (kept unless the left channel
+    is silent) and the right channel (only while the left one is silent so
+    far). A candidate is dropped as soon as the analysis rules it out.
+    """
+    def __init__(self, mono_path, samplerate, subtype, keep_left=False):
+        self.keep_left = keep_left  # Always produce an output (left channel for true stereo)
+        self.writers = {}
+        for side in ("left", "right"):
+            temp_path = get_temp_output_path(mono_path, side)
+            self.writers[side] = (temp_path, sf.SoundFile(temp_path, 'w', samplerate, 1, subtype, format='WAV'))
+
+    def write(self, left_channel, right_channel, classifier, unpack=None):
+        if "left" in self.writers and not (self.keep_left or classifier.right_silent or classifier.equal):
+            self.discard("left")
+        if "right" in self.writers and not classifier.left_silent:
+            self.discard("right")
+
+        for side, channel in (("left", left_channel), ("right", right_channel)):
+            if side in self.writers:
+                self.writers[side][1].write(unpack(channel) if unpack else channel)
+
+    def finish(self, classifier):
+        """
+        Close the capture once the whole file has been analysed.
+
+        Returns:
+            str: Temporary path of the mono version, or None for true stereo
+            (unless keep_left is set)
+        """
+        kept_path = None
+        if self.keep_left or classifier.verdict() != "stereo":
+            side = "right" if classifier.left_silent else "left"
+            if side in self.writers:
+                kept_path, writer = self.writers.pop(side)
+                writer.close()
+        self.discard()
+        return kept_path
+
+    def discard(self, side=None):
+        for name in ([side] if side else list(self.writers)):
+            temp_path, writer = self.writers.pop(name)
+            writer.close()
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+def map_pcm_samples(file, layout):
+    """
+    Memory-map the data chunk of a WAV as one structured record per frame.
+
+    Each channel is a field ('ch0', 'ch1', ...), so samples['ch0'] is a
+    zero-copy strided view of the left channel.
+
+    Returns:
+        numpy.memmap or None if there is nothing to map
+    """
+    if not layout['frames']:
+        return None
+    sample_dtype, _ = PCM_SAMPLE_LAYOUTS[(layout['format'], layout['bits'])]
+    sample_size = layout['bits'] // 8
+    frame_dtype = np.dtype({
+        'names': [f'ch{i}' for i in range(layout['channels'])],
+        'formats': [sample_dtype] * layout['channels'],
+        'offsets': [i * sample_size for i in range(layout['channels'])],
+        'itemsize': layout['block_align'],
+    })
+    return np.memmap(file, dtype=frame_dtype, mode='r', offset=layout['data_offset'], shape=(layout['frames'],))
+
+class ChannelClassifier:
+    """
+    Running silence and equality state of a stereo signal fed block by block.
+
+    Keeps only three flags, so memory does not depend on the file length.
+    A tolerance of 0 compares samples exactly (integer PCM).
+    """
+    def __init__(self, tolerance=0, silence_value=0):
+        self.tolerance = tolerance
+        self.silence_value = silence_value
+        self.left_silent = True
+        self.right_silent = True
+        self.equal = True
+        self.frames = 0  # Frames fed so far (reading may stop early)
+
+    def feed(self, left_channel, right_channel):
+        """
+        Update the state with the next block of both channels.
+
+        Returns:
+            bool: True once the channels are known to be true stereo, so the
+            caller can stop reading.
+        """
+        if self.left_silent:
+            self.left_silent = is_silent(left_channel, self.tolerance, self.silence_value)
+        if self.right_silent:
+            self.right_silent = is_silent(right_channel, self.tolerance, self.silence_value)
+        if self.equal:
+            self.equal = channels_equal(left_channel, right_channel, self.tolerance)
+        self.frames += len(left_channel)
+        return self.is_true_stereo()
+
+    def is_true_stereo(self):
+        return not (self.left_silent or self.right_silent or self.equal)
+
+    def verdict(self):
+        if self.left_silent or self.right_silent:
+            return "silent_channel"
+        if self.equal:
+            return "dualmono"
+        return "stereo"
+
+def detect_audio_type(data):
+    try:
+        if data.shape[1] == 2:
+            classifier = ChannelClassifier(get_tolerance(data.dtype))
+            for start in range(0, len(data), ANALYSIS_BLOCK_FRAMES):
+                block = data[start:start + ANALYSIS_BLOCK_FRAMES]
+                if classifier.feed(block[:, 0], block[:, 1]):
+                    return "True stereo"
+
+            # A silent channel or two equal channels
+            if classifier.verdict() == "stereo":
                 return "True stereo"
+            return "False stereo"
 
         return "Unknown"
     except Exception as e:
@@ -712,8 +2750,7 @@ def is_mono(file_path):
         bool: True if the file is mono, False otherwise
     """
     try:
-        data, sample_rate = sf.read(file_path, always_2d=True)
-        return data.shape[1] == 1  # True if it's mono (1 channel)
+        return get_audio_info(file_path).channels == 1  # Header only, no sample data is read
     except Exception as e:
         print(f"Error checking if file is mono {file_path}: {str(e)}")
         return False  # By default assume is not mono if there is error
@@ -724,29 +2761,62 @@ def confirm_convert_LR_to_stereo(folder):
         selected_pairs = show_LR_pairs(matching_files)  # Show selection dialog
         
         if selected_pairs:
-            progress_window = ProgressWindow("Converting L/R to stereo")
-            total_pairs = len(selected_pairs)
-            processed_pairs = 0
-            
-            for left_file, right_file in selected_pairs:
-                progress_window.update(f"Processing: {os.path.basename(left_file)} + {os.path.basename(right_file)}", 
-                                     processed_pairs, total_pairs)
-                
-                if not is_mono(left_file):
-                    left_file = convert_to_mono(left_file)
-                if not is_mono(right_file):
-                    right_file = convert_to_mono(right_file)
-                convert_to_stereo(left_file, right_file, progress_window)
-                
-                processed_pairs += 1
-                progress_window.add_log(f"Files converted to stereo: {left_file} + {right_file}")
-            
-            progress_window.root.destroy()
+            convert_LR_pairs(selected_pairs)
     else:
         print("No matching L/R pairs found in the folder.")
 
+def convert_LR_pairs(lr_pairs, progress_window=None, workers=CONVERSION_WORKERS):
+    """
+    Merge L/R pairs into stereo files.
+
+    Returns:
+        list: The stereo file created for each pair (None where it failed)
+    """
+    if not lr_pairs:
+        return []
+    if progress_window is None:
+        progress_window = ProgressWindow("Converting L/R to stereo")
+        try:
+            return progress_window.run_task(convert_LR_pairs, lr_pairs, progress_window, workers)
+        finally:
+            progress_window.close()
+    # Two pairs merged into the same stereo file would overwrite each other: only the first is merged
+    jobs = []
+    job_indices = []
+    output_files = set()
+    for index, (left_file, right_file) in enumerate(lr_pairs):
+        output_file = os.path.normcase(get_stereo_output_path(left_file, right_file))
+        if output_file in output_files:
+            progress_window.add_log(f"Skipping {os.path.basename(left_file)} + {os.path.basename(right_file)}: "
+                                    f"another pair is merged into {os.path.basename(output_file)}")
+            continue
+        output_files.add(output_file)
+        jobs.append((f"{os.path.basename(left_file)} + {os.path.basename(right_file)}", merge_LR_pair, (left_file, right_file)))
+        job_indices.append(index)
+    results = [None] * len(lr_pairs)
+    for index, result in zip(job_indices, run_conversion_jobs(jobs, progress_window, workers)):
+        results[index] = result
+    return results
+
+def merge_LR_pair(left_file, right_file, progress_window=None):
+    """
+    Make sure both files of an L/R pair are mono, then merge them into a stereo file.
+
+    Returns:
+        str: Path of the stereo file, or None on error
+    """
+    if not is_mono(left_file):
+        left_file = convert_to_mono(left_file)
+    if not is_mono(right_file):
+        right_file = convert_to_mono(right_file)
+    output_file = convert_to_stereo(left_file, right_file, progress_window)
+    
+    if progress_window and output_file:
+        progress_window.add_log(f"Files converted to stereo: {left_file} + {right_file}")
+    return output_file
+
 def confirm_reorder_files(folder):
-    wav_files = [file for file in os.listdir(folder) if file.endswith(".wav")]
+    wav_files = [file for file in get_snapshot(folder).list_files() if file.endswith(".wav")]
     if wav_files:
         reorder = messagebox.askyesno("Confirm", "Do you want to reorder the files (and maybe categorize them)?")
         if reorder:
@@ -760,61 +2830,51 @@ def reorder_files(folder):
 
 def find_matching_files(folder_path):
     """
-    Find matching L/R files in the folder, handling case-sensitivity properly.
-    Uses os.path.normcase() for cross-platform case normalization.
+    Index the files with a left/right marker by normalised stem and side.
+    Each name is tokenised once with LR_NAME_PATTERN; stems are compared
+    with os.path.normcase() for cross-platform case handling.
+
+    Returns:
+        dict: {normalised stem: {'L': [file tokens], 'R': [file tokens]}},
+        where file tokens are dicts with 'path', 'stem', 'marker' and 'tags'
     """
     matching_files = {}
-    for root_folder, _, files in os.walk(folder_path):
-        if os.path.basename(root_folder) == "-- OBSOLETE FILES":  # Ignore the "-- OBSOLETE FILES" folder
+    for root_folder, files in get_snapshot(folder_path).walk():
+        if os.path.basename(root_folder) == OBSOLETE_FOLDER_NAME:  # Ignore the "-- OBSOLETE FILES" folder
             continue
         for file in files:
-            if file.startswith('.'):
+            if file.startswith('.') or not file.endswith(".wav"):  # Sidecars like "Gtr_L.asd" are never paired
                 continue
-            
-            # Improved regex to handle common misspellings and variations
-            # Pattern: base_name + optional separator + optional left/right indicator + optional (tags) + extension
-            match = re.match(r'(.+?)(?:_|\s)*(?:left|right|l|r|rigth|rigt|righ)?(?:\s*\(.*?\))?\.(.+)', file, re.IGNORECASE)
-            if match:
-                base_name = match.group(1)
-                # Remove trailing spaces or underscores that might be left after suffix removal
-                base_name = base_name.rstrip(' _')
-                # Use normcase for cross-platform case handling
-                # On Windows: converts to lowercase, on macOS/Linux: preserves case but helps with normalization
-                normalized_name = os.path.normcase(base_name)
-                if normalized_name in matching_files:
-                    matching_files[normalized_name].append(os.path.join(root_folder, file))
-                else:
-                    matching_files[normalized_name] = [os.path.join(root_folder, file)]
+            match = LR_NAME_PATTERN.match(file)
+            if not match or not match.group('side'):
+                continue
+            marker = match.group('side')
+            stem = match.group('stem')
+            sides = matching_files.setdefault(os.path.normcase(stem), {'L': [], 'R': []})
+            sides[LR_SIDE_MARKERS[marker.lower()]].append({
+                'path': os.path.join(root_folder, file),
+                'stem': stem,
+                'marker': marker,
+                'tags': match.group('tags').strip().lower(),
+            })
     return matching_files
 
 def convert_to_mono(file_path):
     try:
-        # Use soundfile to read the file
-        data, sample_rate = sf.read(file_path, always_2d=True)
-        
         # If the file already has tag "(mono)", it does not need conversion
         if "(mono)" not in file_path.lower():
             # If you have tag "(dualmono)", turn it to mono
             if "(dualmono)" in file_path.lower():
-                # Take only the left channel
-                if data.shape[1] == 2:  # Verify if it's stereo
-                    mono_data = data[:, 0]  # Take only the first channel (left)
-                else:
-                    mono_data = data  # If it is mono, there are no necessary changes
-                
                 # Update file name
                 file_name, file_ext = os.path.splitext(file_path)
                 new_file_path = f"{file_name} (mono){file_ext}"
                 
-                # Save mono file preserving the original format
-                file_info = sf.info(file_path)
-                sf.write(new_file_path, mono_data, sample_rate, subtype=file_info.subtype)
+                # Stream the active channel to the mono file, preserving the original format
+                convert_file_to_mono(file_path, new_file_path)
                 print(f"File converted to mono: {file_path} -> {new_file_path}")
                 
                 # Move original file to an OBSOLETE folder
-                obsolete_folder_path = os.path.join(os.path.dirname(file_path), "-- OBSOLETE FILES")
-                os.makedirs(obsolete_folder_path, exist_ok=True)
-                shutil.move(file_path, os.path.join(obsolete_folder_path, os.path.basename(file_path)))
+                move_to_obsolete(file_path)
                 print(f"Dualmono file moved to OBSOLETE FILES: {file_path}")
                 
                 return new_file_path
@@ -829,90 +2889,146 @@ def convert_to_stereo(left_file_path, right_file_path, progress_window=None):
         progress_window.add_log(f"Processing L/R pair: {os.path.basename(left_file_path)} and {os.path.basename(right_file_path)}")
     
     # Verify files exist
-    if not os.path.exists(left_file_path):
+    if not file_exists(left_file_path):
         print(f"Error: Left file not found: {left_file_path}")
         return None
-    if not os.path.exists(right_file_path):
+    if not file_exists(right_file_path):
         print(f"Error: Right file not found: {right_file_path}")
         return None
     
     # Get file info to preserve original format
     try:
-        left_info = sf.info(left_file_path)
-        right_info = sf.info(right_file_path)
+        left_info = get_audio_info(left_file_path)
+        right_info = get_audio_info(right_file_path)
         
         # Compare sample rates
         if left_info.samplerate != right_info.samplerate:
             print(f"Warning: Different sample rates - L: {left_info.samplerate} vs R: {right_info.samplerate}")
         
-        subtype = left_info.subtype  # Use left file's subtype as reference
+        # Mixed widths (e.g. PCM_16 + PCM_24) are merged at the wider subtype
+        subtype = get_common_subtype(left_info.subtype, right_info.subtype) or left_info.subtype
         
-        # Read files preserving original format
-        left_data, left_sample_rate = sf.read(left_file_path, always_2d=True)
-        right_data, right_sample_rate = sf.read(right_file_path, always_2d=True)
+        # Read files preserving original format (integer PCM stays integer)
+        dtype = get_common_dtype(left_info.subtype, right_info.subtype)
         
         if progress_window:
-            progress_window.add_log(f"Read files - L: {len(left_data)} samples, R: {len(right_data)} samples")
+            progress_window.add_log(f"Read files - L: {left_info.frames} samples, R: {right_info.frames} samples")
         
         # Adjust data length to the minimum of both channels
-        min_len = min(len(left_data), len(right_data))
-        left_data = left_data[:min_len]
-        right_data = right_data[:min_len]
+        min_len = min(left_info.frames, right_info.frames)
         
         if progress_window:
             progress_window.add_log(f"Combining {min_len} samples (trimmed to shortest file)")
         
-        # Combine left and right channels to create stereo
-        stereo_data = np.column_stack((left_data[:,0], right_data[:,0]))
-        
     except Exception as e:
         error_msg = f"Error processing files: {str(e)}"
-        print(error_msg)
         if progress_window:
             progress_window.add_log(error_msg)
+        else:
+            print(error_msg)
         return None
     
-    # Get base name for stereo file
-    base_name_left = os.path.splitext(os.path.basename(left_file_path))[0]
-    base_name_right = os.path.splitext(os.path.basename(right_file_path))[0] if right_file_path else None
-    
     if progress_window:
         progress_window.add_log("Generating name for stereo file...")
     
-    if base_name_right:
-        base_name_stereo = ''
-        for c1, c2 in zip(base_name_left, base_name_right):
-            # Use normcase for cross-platform case-insensitive comparison
-            if os.path.normcase(c1) == os.path.normcase(c2):
-                base_name_stereo += c1
-            else:
-                break
-    else:
-        base_name_stereo = base_name_left
-            
     # Save stereo file preserving original bit depth
-    output_file = os.path.join(os.path.dirname(left_file_path), f"{base_name_stereo}(stereo).wav")
+    output_file = get_stereo_output_path(left_file_path, right_file_path)
+    if file_exists(output_file):
+        # Never replace a stereo file merged from another pair (or made by the user)
+        error_msg = f"Error: stereo file already exists, pair not merged: {os.path.basename(output_file)}"
+        if progress_window:
+            progress_window.add_log(error_msg)
+        else:
+            print(error_msg)
+        return None
     
     if progress_window:
         progress_window.add_log(f"Saving stereo file (preserving {subtype}): {os.path.basename(output_file)}")
     
-    sf.write(output_file, stereo_data, left_sample_rate, subtype=subtype)
+    try:
+        # Combine left and right channels block by block to create stereo
+        started = time.perf_counter()
+        with atomic_output(output_file) as temp_file:
+            interleave_to_stereo(left_file_path, right_file_path, temp_file, left_info.samplerate, subtype, dtype)
+        profile_operation('interleave_to_stereo', started, read_files=[left_file_path, right_file_path],
+                          written_files=[output_file])
+    except Exception as e:
+        error_msg = f"Error processing files: {str(e)}"
+        if progress_window:
+            progress_window.add_log(error_msg)
+        else:
+            print(error_msg)
+        return None  # atomic_output never leaves a partial stereo file behind
     
     if progress_window:
         progress_window.add_log("Stereo file saved successfully")
         progress_window.add_log("Moving original files to OBSOLETE folder...")
     
     # Move original files to OBSOLETE folder
-    obsolete_folder_path = os.path.join(os.path.dirname(left_file_path), "-- OBSOLETE FILES")
-    os.makedirs(obsolete_folder_path, exist_ok=True)
-    shutil.move(left_file_path, os.path.join(obsolete_folder_path, os.path.basename(left_file_path)))
+    move_to_obsolete(left_file_path)
     if right_file_path:
-        shutil.move(right_file_path, os.path.join(obsolete_folder_path, os.path.basename(right_file_path)))
+        move_to_obsolete(right_file_path, os.path.dirname(left_file_path))
     
     if progress_window:
         progress_window.add_log("Process completed")
     
     return output_file
 
+def get_stereo_output_path(left_file_path, right_file_path):
+    """
+    Get the stereo file an L/R pair is merged into: the start both names
+    share, followed by "(stereo).wav", in the left file's folder.
+    """
+    base_name_left = os.path.splitext(os.path.basename(left_file_path))[0]
+    base_name_right = os.path.splitext(os.path.basename(right_file_path))[0] if right_file_path else None
+    
+    if base_name_right:
+        base_name_stereo = ''
+        for c1, c2 in zip(base_name_left, base_name_right):
+            # Use normcase for cross-platform case-insensitive comparison
+            if os.path.normcase(c1) == os.path.normcase(c2):
+                base_name_stereo += c1
+            else:
+                break
+    else:
+        base_name_stereo = base_name_left
+    return os.path.join(os.path.dirname(left_file_path), f"{base_name_stereo}(stereo).wav")
+
+def interleave_to_stereo(left_file_path, right_file_path, output_file, samplerate, subtype, dtype):
+    """
+    Merge two mono files into a stereo file, block by block.
+
+    Matching blocks of both files are read into reusable buffers and
+    interleaved into one preallocated stereo block before writing, so peak
+    memory is a few blocks whatever the track length. The output is trimmed
+    to the shorter file. Only the first channel of each source is used.
+
+    Returns:
+        int: Number of frames written
+    """
+    with sf.SoundFile(left_file_path) as left_source, sf.SoundFile(right_file_path) as right_source:
+        left_buffer = np.empty((ANALYSIS_BLOCK_FRAMES, left_source.channels), dtype=dtype)
+        right_buffer = np.empty((ANALYSIS_BLOCK_FRAMES, right_source.channels), dtype=dtype)
+        stereo_block = np.empty((ANALYSIS_BLOCK_FRAMES, 2), dtype=dtype)
+        frames_written = 0
+
+        with sf.SoundFile(output_file, 'w', samplerate, 2, subtype, format='WAV') as output:
+            while True:
+                left_block = left_source.read(dtype=dtype, always_2d=True, out=left_buffer)
+                right_block = right_source.read(dtype=dtype, always_2d=True, out=right_buffer)
+                frames = min(len(left_block), len(right_block))
+                if frames == 0:
+                    break
+                stereo_block[:frames, 0] = left_block[:frames, 0]
+                stereo_block[:frames, 1] = right_block[:frames, 0]
+                output.write(stereo_block[:frames])
+                frames_written += frames
+
+    return frames_written
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed by the analysis pool in frozen executables
+    arguments = parse_arguments()
+    if arguments.headless:
+        sys.exit(headless_main(arguments))
     main()